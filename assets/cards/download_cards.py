@@ -10,8 +10,10 @@
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 # 扑克牌配置
 SUITS = ['spades', 'hearts', 'diamonds', 'clubs']  # 黑桃、红桃、方块、梅花  
@@ -19,6 +21,9 @@ SUIT_SYMBOLS = {'spades': '♠', 'hearts': '♥', 'diamonds': '♦', 'clubs': '
 SUIT_COLORS = {'spades': 'black', 'hearts': 'red', 'diamonds': 'red', 'clubs': 'black'}
 RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
 
+# 素材输出目录（即本脚本所在目录）
+CARDS_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # 卡片尺寸 (扑克牌标准比例 5:7)
 CARD_WIDTH = 200
 CARD_HEIGHT = 280
@@ -31,104 +36,150 @@ WHITE_COLOR = (255, 255, 255, 255)
 BACKGROUND_COLOR = (255, 255, 255, 255)
 BORDER_COLOR = (0, 0, 0, 255)
 
+# 字体查找顺序：插件自带字体优先，其次是系统字体
+FONT_PATHS = [
+    os.path.join(CARDS_DIR, "..", "fonts", "arial.ttf"),
+    "arial.ttf",
+]
+
+@lru_cache(maxsize=None)
 def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    """获取字体"""
-    try:
-        if bold:
-            return ImageFont.truetype("arial.ttf", size)
-        else:
-            return ImageFont.truetype("arial.ttf", size)
-    except:
-        return ImageFont.load_default()
+    """获取字体（按 size/bold 缓存，每种字号只加载一次）"""
+    for font_path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=None)
+def render_glyph(text: str, size: int, bold: bool, color: Tuple[int, int, int, int]) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+    """
+    渲染并缓存字形位图
+
+    Returns:
+        (紧凑的RGBA字形图, 相对绘制原点的bbox)
+    """
+    font = get_font(size, bold)
+    bbox = font.getbbox(text)
+    glyph = Image.new('RGBA', (max(bbox[2] - bbox[0], 1), max(bbox[3] - bbox[1], 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(glyph).text((-bbox[0], -bbox[1]), text, font=font, fill=color)
+    return glyph, bbox
+
+def paste_glyph(card: Image.Image, xy: Tuple[int, int], text: str, size: int, 
+                color: Tuple[int, int, int, int], bold: bool = False) -> None:
+    """在与 draw.text(xy, ...) 相同的位置合成缓存的字形"""
+    glyph, bbox = render_glyph(text, size, bold, color)
+    card.alpha_composite(glyph, (xy[0] + bbox[0], xy[1] + bbox[1]))
 
 def draw_rounded_rectangle(draw: ImageDraw.Draw, xy: List[Tuple[int, int]], 
                           radius: int, fill=None, outline=None, width=1):
-    """绘制圆角矩形"""
+    """绘制圆角矩形（使用Pillow原生实现）"""
     x1, y1, x2, y2 = xy[0][0], xy[0][1], xy[1][0], xy[1][1]
+    draw.rounded_rectangle((x1, y1, x2, y2), radius=radius, fill=fill, outline=outline, width=width)
+
+@lru_cache(maxsize=None)
+def card_blank() -> Image.Image:
+    """
+    生成带边框的空白牌面模板（只绘制一次）
     
-    # 绘制主体矩形
-    draw.rectangle([x1 + radius, y1, x2 - radius, y2], fill=fill)
-    draw.rectangle([x1, y1 + radius, x2, y2 - radius], fill=fill)
-    
-    # 绘制四个角的圆
-    draw.ellipse([x1, y1, x1 + 2*radius, y1 + 2*radius], fill=fill)
-    draw.ellipse([x2 - 2*radius, y1, x2, y1 + 2*radius], fill=fill)
-    draw.ellipse([x1, y2 - 2*radius, x1 + 2*radius, y2], fill=fill)
-    draw.ellipse([x2 - 2*radius, y2 - 2*radius, x2, y2], fill=fill)
-    
-    if outline:
-        # 绘制边框
-        draw.arc([x1, y1, x1 + 2*radius, y1 + 2*radius], 180, 270, fill=outline, width=width)
-        draw.arc([x2 - 2*radius, y1, x2, y1 + 2*radius], 270, 360, fill=outline, width=width)
-        draw.arc([x1, y2 - 2*radius, x1 + 2*radius, y2], 90, 180, fill=outline, width=width)
-        draw.arc([x2 - 2*radius, y2 - 2*radius, x2, y2], 0, 90, fill=outline, width=width)
-        
-        draw.line([x1 + radius, y1, x2 - radius, y1], fill=outline, width=width)
-        draw.line([x1 + radius, y2, x2 - radius, y2], fill=outline, width=width)
-        draw.line([x1, y1 + radius, x1, y2 - radius], fill=outline, width=width)
-        draw.line([x2, y1 + radius, x2, y2 - radius], fill=outline, width=width)
-
-def create_card_front(rank: str, suit: str) -> Image.Image:
-    """创建扑克牌正面"""
-    # 创建画布
+    所有牌的底色和边框完全相同，逐张生成时直接复制模板
+    """
     card = Image.new('RGBA', (CARD_WIDTH, CARD_HEIGHT), BACKGROUND_COLOR)
     draw = ImageDraw.Draw(card)
     
     # 绘制卡片边框
     draw_rounded_rectangle(draw, [(2, 2), (CARD_WIDTH-3, CARD_HEIGHT-3)], 
                           CORNER_RADIUS, fill=WHITE_COLOR, outline=BORDER_COLOR, width=3)
+    return card
+
+def _text_size(text: str, size: int, bold: bool = False) -> Tuple[int, int]:
+    """计算文本尺寸"""
+    bbox = get_font(size, bold).getbbox(text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+@lru_cache(maxsize=None)
+def rank_positions(rank: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """牌值的左上角和右下角绘制位置（每个牌值只计算一次）"""
+    rank_width, rank_height = _text_size(rank, 40, bold=True)
+    return (15, 15), (CARD_WIDTH - rank_width - 15, CARD_HEIGHT - rank_height - 60)
+
+@lru_cache(maxsize=None)
+def symbol_positions(symbol: str) -> Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]:
+    """花色符号的左上角、右下角和中央绘制位置（每个花色只计算一次）"""
+    symbol_width, symbol_height = _text_size(symbol, 36)
+    center_symbol_width, center_symbol_height = _text_size(symbol, 80)
+    
+    center_x = (CARD_WIDTH - center_symbol_width) // 2
+    center_y = (CARD_HEIGHT - center_symbol_height) // 2
+    return ((15, 60),
+            (CARD_WIDTH - symbol_width - 15, CARD_HEIGHT - symbol_height - 15),
+            (center_x, center_y))
+
+def create_card_front(rank: str, suit: str, canvas: Optional[Image.Image] = None) -> Image.Image:
+    """
+    创建扑克牌正面
+    
+    Args:
+        rank: 牌值
+        suit: 花色
+        canvas: 可复用的画布，传入时原地重置并绘制，避免每张牌重新分配
+    """
+    if canvas is None:
+        # 从空白模板复制画布
+        card = card_blank().copy()
+    else:
+        card = canvas
+        card.paste(card_blank(), (0, 0))
     
     # 获取颜色和符号
     color = RED_COLOR if SUIT_COLORS[suit] == 'red' else BLACK_COLOR
     symbol = SUIT_SYMBOLS[suit]
     
-    # 字体设置
-    rank_font_large = get_font(40, bold=True)
-    rank_font_small = get_font(24, bold=True)
-    suit_font_large = get_font(80)
-    suit_font_small = get_font(36)
+    # 牌值位置只取决于牌值，花色位置只取决于花色，均已预先计算
+    rank_top_left, rank_bottom_right = rank_positions(rank)
+    symbol_top_left, symbol_bottom_right, symbol_center = symbol_positions(symbol)
     
     # 左上角的牌值和花色
-    draw.text((15, 15), rank, font=rank_font_large, fill=color)
-    draw.text((15, 60), symbol, font=suit_font_small, fill=color)
+    paste_glyph(card, rank_top_left, rank, 40, color, bold=True)
+    paste_glyph(card, symbol_top_left, symbol, 36, color)
     
     # 右下角的牌值和花色（旋转180度的效果）
-    # 计算文本尺寸
-    rank_bbox = draw.textbbox((0, 0), rank, font=rank_font_large)
-    rank_width = rank_bbox[2] - rank_bbox[0]
-    rank_height = rank_bbox[3] - rank_bbox[1]
-    
-    symbol_bbox = draw.textbbox((0, 0), symbol, font=suit_font_small)
-    symbol_width = symbol_bbox[2] - symbol_bbox[0]
-    symbol_height = symbol_bbox[3] - symbol_bbox[1]
-    
-    # 右下角位置
-    draw.text((CARD_WIDTH - rank_width - 15, CARD_HEIGHT - rank_height - 60), 
-              rank, font=rank_font_large, fill=color)
-    draw.text((CARD_WIDTH - symbol_width - 15, CARD_HEIGHT - symbol_height - 15), 
-              symbol, font=suit_font_small, fill=color)
+    paste_glyph(card, rank_bottom_right, rank, 40, color, bold=True)
+    paste_glyph(card, symbol_bottom_right, symbol, 36, color)
     
     # 中央大花色符号
-    center_symbol_bbox = draw.textbbox((0, 0), symbol, font=suit_font_large)
-    center_symbol_width = center_symbol_bbox[2] - center_symbol_bbox[0]
-    center_symbol_height = center_symbol_bbox[3] - center_symbol_bbox[1]
-    
-    center_x = (CARD_WIDTH - center_symbol_width) // 2
-    center_y = (CARD_HEIGHT - center_symbol_height) // 2
-    draw.text((center_x, center_y), symbol, font=suit_font_large, fill=color)
+    paste_glyph(card, symbol_center, symbol, 80, color)
     
     return card
 
+@lru_cache(maxsize=None)
+def diamond_grid_mask(diamond_size: int = 15, spacing: int = 25) -> Image.Image:
+    """
+    生成牌背菱形网格遮罩（只构建一次）
+    
+    单个菱形先画进一个图块，再平铺到整张牌大小的遮罩上
+    """
+    tile = Image.new('L', (spacing, spacing), 0)
+    ImageDraw.Draw(tile).polygon([
+        (0, diamond_size//2),
+        (diamond_size//2, 0),
+        (diamond_size, diamond_size//2),
+        (diamond_size//2, diamond_size)
+    ], fill=255)
+    
+    mask = Image.new('L', (CARD_WIDTH, CARD_HEIGHT), 0)
+    for x in range(30, CARD_WIDTH - 30, spacing):
+        for y in range(30, CARD_HEIGHT - 30, spacing):
+            mask.paste(tile, (x, y))
+    return mask
+
 def create_card_back() -> Image.Image:
     """创建扑克牌背面"""
-    # 创建画布
-    card = Image.new('RGBA', (CARD_WIDTH, CARD_HEIGHT), BACKGROUND_COLOR)
+    # 从空白模板复制画布
+    card = card_blank().copy()
     draw = ImageDraw.Draw(card)
     
-    # 绘制卡片边框
-    draw_rounded_rectangle(draw, [(2, 2), (CARD_WIDTH-3, CARD_HEIGHT-3)], 
-                          CORNER_RADIUS, fill=WHITE_COLOR, outline=BORDER_COLOR, width=3)
-    
     # 背景颜色
     bg_color = (25, 50, 125, 255)  # 深蓝色
     draw_rounded_rectangle(draw, [(8, 8), (CARD_WIDTH-9, CARD_HEIGHT-9)], 
@@ -137,26 +188,14 @@ def create_card_back() -> Image.Image:
     # 绘制装饰图案
     pattern_color = (255, 255, 255, 180)
     
-    # 绘制菱形网格图案
-    diamond_size = 15
-    spacing = 25
-    
-    for x in range(30, CARD_WIDTH - 30, spacing):
-        for y in range(30, CARD_HEIGHT - 30, spacing):
-            # 绘制小菱形
-            diamond_points = [
-                (x, y + diamond_size//2),
-                (x + diamond_size//2, y),
-                (x + diamond_size, y + diamond_size//2),
-                (x + diamond_size//2, y + diamond_size)
-            ]
-            draw.polygon(diamond_points, fill=pattern_color)
+    # 绘制菱形网格图案（整张遮罩一次性填色）
+    card.paste(pattern_color, (0, 0), diamond_grid_mask())
     
     # 中央标志
     center_x, center_y = CARD_WIDTH // 2, CARD_HEIGHT // 2
-    font = get_font(24, bold=True)
     text = "AstrBot"
-    text_bbox = draw.textbbox((0, 0), text, font=font)
+    text_color = (25, 50, 125, 255)
+    _, text_bbox = render_glyph(text, 24, True, text_color)
     text_width = text_bbox[2] - text_bbox[0]
     text_height = text_bbox[3] - text_bbox[1]
     
@@ -170,34 +209,48 @@ def create_card_back() -> Image.Image:
                           8, fill=(255, 255, 255, 200))
     
     # 绘制文本
-    draw.text((center_x - text_width//2, center_y - text_height//2), 
-              text, font=font, fill=(25, 50, 125, 255))
+    paste_glyph(card, (center_x - text_width//2, center_y - text_height//2), 
+                text, 24, text_color, bold=True)
     
     return card
 
+# 子进程内复用的画布（由进程池 initializer 创建）
+_worker_canvas: Optional[Image.Image] = None
+
+def _init_worker() -> None:
+    """进程池初始化：为每个子进程分配一块画布"""
+    global _worker_canvas
+    _worker_canvas = Image.new('RGBA', (CARD_WIDTH, CARD_HEIGHT))
+
+def _render_and_save(job: Tuple[str, str, str]) -> str:
+    """生成并保存单张扑克牌（在子进程中执行，字形缓存按进程独立）"""
+    rank, suit, filepath = job
+    card = create_card_front(rank, suit, _worker_canvas)
+    # 无损WebP比PNG更小、解码更快；method=0 为最快编码
+    card.save(filepath, 'WEBP', lossless=True, method=0)
+    return filepath
+
 def generate_all_cards():
     """生成所有扑克牌"""
     # 确保目录存在
-    os.makedirs(os.path.dirname(__file__), exist_ok=True)
+    os.makedirs(CARDS_DIR, exist_ok=True)
     
     print("生成扑克牌素材...")
     
     # 生成牌背
     print("生成牌背...")
     back_card = create_card_back()
-    back_path = os.path.join(os.path.dirname(__file__), "back.png")
-    back_card.save(back_path, 'PNG', optimize=True)
+    back_path = os.path.join(CARDS_DIR, "back.webp")
+    back_card.save(back_path, 'WEBP', lossless=True, method=6)
     print(f"牌背已保存: {back_path}")
     
-    # 生成52张牌
+    # 52张牌相互独立，分发到进程池并行生成
+    jobs = [(rank, suit, os.path.join(CARDS_DIR, f"{rank.lower()}_{suit}.webp"))
+            for suit in SUITS for rank in RANKS]
     card_count = 0
-    for suit in SUITS:
-        for rank in RANKS:
-            print(f"生成 {rank} of {suit}...")
-            card = create_card_front(rank, suit)
-            filename = f"{rank.lower()}_{suit}.png"
-            filepath = os.path.join(os.path.dirname(__file__), filename)
-            card.save(filepath, 'PNG', optimize=True)
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as executor:
+        for filepath in executor.map(_render_and_save, jobs):
+            print(f"已生成 {os.path.basename(filepath)}")
             card_count += 1
     
     print(f"完成！共生成 {card_count + 1} 张扑克牌图片（包括牌背）")
@@ -8,6 +8,7 @@
 """
 
 import asyncio
+import os
 from typing import AsyncGenerator, Dict, Any, List, Optional, Tuple
 from astrbot.api.event import AstrMessageEvent, MessageEventResult
 from astrbot.api.event.filter import command
@@ -19,11 +20,57 @@ from .services.game_manager import GameManager
 from .services.command_handler import CommandHandler
 from .services.player_service import PlayerService
 from .services.message_service import UniversalMessageService
+from .models.game import GamePhase
 from .utils.storage_manager import StorageManager
 from .utils.data_migration import DataMigration
-from .utils.decorators import command_error_handler
+from .utils.decorators import command_error_handler, log_errors
 from .utils.user_isolation import UserIsolation
 from .utils.error_handler import GameError
+from .utils.money_formatter import fmt_chips
+from .utils.async_utils import create_eager_task
+
+
+# 手牌等级的中文名称
+HAND_RANK_NAMES = {
+    'ROYAL_FLUSH': '皇家同花顺',
+    'STRAIGHT_FLUSH': '同花顺', 
+    'FOUR_OF_A_KIND': '四条',
+    'FULL_HOUSE': '葫芦',
+    'FLUSH': '同花',
+    'STRAIGHT': '顺子',
+    'THREE_OF_A_KIND': '三条',
+    'TWO_PAIR': '两对',
+    'PAIR': '一对',
+    'HIGH_CARD': '高牌'
+}
+
+# 可用操作提示模板，key 为 (是否需要跟注, 是否还有筹码)
+ACTION_HINTS = {
+    (True, True): "跟注 {} | 加注 | 弃牌 | 全下",
+    (True, False): "跟注 {} | 加注 | 弃牌",
+    (False, True): "让牌 | 加注 | 弃牌 | 全下",
+    (False, False): "让牌 | 加注 | 弃牌",
+}
+
+# 摊牌结果消息的固定标题
+SHOWDOWN_HEADER = "\n".join(["🎊 德州扑克 - 游戏结束！", "=" * 25, "🃏 玩家手牌:"])
+
+
+def _bind_action(action: str, name: str, doc: str):
+    """
+    生成无参数的动作命令处理函数
+
+    各动作命令只差一个动作名，统一由此生成，逐条转发命令处理器产出的消息。
+    函数名与文档需逐个设置：AstrBot 以函数名区分处理器，并以文档作为命令说明。
+    """
+    async def handler(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
+        async for result in self.command_handler.handle_player_action(event, action):
+            yield result
+
+    handler.__name__ = name
+    handler.__qualname__ = f"TexasPokerPlugin.{name}"
+    handler.__doc__ = doc
+    return handler
 
 
 @register("astrbot_plugin_texaspoker", "YourName", "德州扑克群内多人对战插件", "1.0.1")
@@ -60,7 +107,7 @@ class TexasPokerPlugin(Star):
         """插件初始化"""
         try:
             # 执行数据迁移（如果需要）
-            await self._perform_data_migration()
+            self._perform_data_migration()
             
             # 初始化游戏管理器
             await self.game_manager.initialize()
@@ -78,12 +125,13 @@ class TexasPokerPlugin(Star):
         try:
             # 安全关闭游戏管理器
             await self.game_manager.terminate()
+            self.message_service.clear_adapter_cache()
             
             logger.info("德州扑克插件已安全停止")
         except Exception as e:
             logger.error(f"插件停止时出错: {e}")
     
-    async def _perform_data_migration(self):
+    def _perform_data_migration(self):
         """执行数据迁移"""
         try:
             migration = DataMigration(self.storage)
@@ -127,11 +175,17 @@ class TexasPokerPlugin(Star):
     @command("德州开始")
     async def start_game(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
         """开始德州扑克游戏"""
-        async for result in self.command_handler.start_game(event):
-            yield result
-        
-        # 发送手牌给每个玩家
-        await self._send_hand_cards_to_players(event)
+        hand_task: Optional[asyncio.Task] = None
+        try:
+            async for result in self.command_handler.start_game(event):
+                # 游戏开始后立即在后台私发手牌，与群内消息的发送并行进行
+                if hand_task is None:
+                    hand_task = create_eager_task(self._send_hand_cards_to_players(event))
+                yield result
+        finally:
+            # 等待手牌发送完成
+            if hand_task is not None:
+                await hand_task
     
     @command("德州状态")
     async def show_game_status(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
@@ -141,11 +195,7 @@ class TexasPokerPlugin(Star):
     
     # ==================== 游戏操作命令 ====================
     
-    @command("跟注")
-    async def call_action(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
-        """跟注"""
-        async for result in self.command_handler.handle_player_action(event, "call"):
-            yield result
+    call_action = command("跟注")(_bind_action("call", "call_action", "跟注"))
     
     @command("加注")
     async def raise_action(self, event: AstrMessageEvent, amount: int = None) -> AsyncGenerator[MessageEventResult, None]:
@@ -157,23 +207,11 @@ class TexasPokerPlugin(Star):
         async for result in self.command_handler.handle_player_action(event, "raise", amount):
             yield result
     
-    @command("弃牌")
-    async def fold_action(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
-        """弃牌"""
-        async for result in self.command_handler.handle_player_action(event, "fold"):
-            yield result
+    fold_action = command("弃牌")(_bind_action("fold", "fold_action", "弃牌"))
     
-    @command("让牌")
-    async def check_action(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
-        """让牌"""
-        async for result in self.command_handler.handle_player_action(event, "check"):
-            yield result
+    check_action = command("让牌")(_bind_action("check", "check_action", "让牌"))
     
-    @command("全下")
-    async def all_in_action(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
-        """全下"""
-        async for result in self.command_handler.handle_player_action(event, "all_in"):
-            yield result
+    all_in_action = command("全下")(_bind_action("all_in", "all_in_action", "全下"))
     
     # ==================== 查询命令 ====================
     
@@ -199,18 +237,25 @@ class TexasPokerPlugin(Star):
     
     async def _send_hand_cards_to_players(self, event: AstrMessageEvent) -> None:
         """发送手牌给每个玩家（通过消息服务）"""
-        try:
+        with log_errors("发送手牌"):
             group_id = event.get_group_id() or UserIsolation.get_isolated_user_id(event)
             game = self.game_manager.get_game_state(group_id)
             
-            if not game or len(game.players) == 0:
+            # 游戏未成功开始时没有手牌可发
+            if not game or len(game.players) == 0 or game.phase == GamePhase.WAITING:
                 return
             
-            # 生成手牌图片
-            hand_images = self.game_manager.generate_hand_images(group_id)
+            # 生成手牌图片（关闭图片私发时跳过渲染，只发文字）
+            if self.storage.get_plugin_config().send_hand_image:
+                hand_images = await self.game_manager.generate_hand_images(group_id)
+            else:
+                hand_images = {}
             
-            # 批量发送手牌
-            players_info = [{'user_id': p.user_id, 'nickname': p.nickname} for p in game.players]
+            # 批量发送手牌（没有图片的玩家以文字发送）
+            players_info = [
+                {'user_id': p.user_id, 'nickname': p.nickname, 'hand_text': " ".join(map(str, p.hole_cards))}
+                for p in game.players
+            ]
             send_results = await self.message_service.send_hand_cards_to_players(players_info, hand_images)
             
             # 记录发送结果
@@ -221,13 +266,13 @@ class TexasPokerPlugin(Star):
                 logger.info(f"手牌发送完成，成功 {success_count}/{total_count}")
             else:
                 logger.warning(f"手牌发送部分失败，成功 {success_count}/{total_count}")
-            
-        except Exception as e:
-            logger.error(f"发送手牌失败: {e}")
     
     async def _send_action_prompt_message(self, group_id: str, game_or_message) -> None:
-        """发送行动提示消息到群聊或处理游戏结果"""
-        try:
+        """发送行动提示消息到群聊或处理游戏结果
+        
+        作为游戏回调的唯一异常边界，下游的阶段消息/摊牌结果发送不再各自捕获异常
+        """
+        with log_errors("发送行动提示消息"):
             # 判断是游戏对象还是普通消息
             if hasattr(game_or_message, 'phase'):
                 # 是游戏对象，根据阶段处理
@@ -237,128 +282,89 @@ class TexasPokerPlugin(Star):
                 success = await self.message_service.send_group_text(group_id, str(game_or_message))
                 if not success:
                     logger.warning(f"发送行动提示消息失败: {group_id}")
-        except Exception as e:
-            logger.error(f"发送行动提示消息异常: {e}")
     
     async def _handle_game_phase_message(self, group_id: str, game) -> None:
         """处理游戏阶段的特殊消息（如摊牌结果）"""
-        try:
-            from .models.game import GamePhase
-            
-            if game.phase == GamePhase.SHOWDOWN:
-                # 摊牌阶段，发送游戏结果
-                await self._send_showdown_results(group_id, game)
-            else:
-                # 普通行动阶段，发送行动提示
-                active_player = game.get_active_player()
-                if active_player:
-                    prompt_message = self._build_action_prompt_message(game, active_player)
-                    success = await self.message_service.send_group_text(group_id, prompt_message)
-                    if not success:
-                        logger.warning(f"发送行动提示失败: {group_id}")
-        except Exception as e:
-            logger.error(f"处理游戏阶段消息失败: {e}")
+        if game.phase == GamePhase.SHOWDOWN:
+            # 摊牌阶段，发送游戏结果
+            await self._send_showdown_results(group_id, game)
+        else:
+            # 普通行动阶段，发送行动提示
+            active_player = game.get_active_player()
+            if active_player:
+                prompt_message = self._build_action_prompt_message(game, active_player)
+                success = await self.message_service.send_group_text(group_id, prompt_message)
+                if not success:
+                    logger.warning(f"发送行动提示失败: {group_id}")
     
     async def _send_showdown_results(self, group_id: str, game) -> None:
         """发送摊牌结果"""
-        try:
-            # 发送摊牌结果文本
-            if hasattr(game, 'showdown_results'):
-                result_message = self._build_showdown_message(game)
-                success = await self.message_service.send_group_text(group_id, result_message)
-                if not success:
-                    logger.warning(f"发送摊牌结果文本失败: {group_id}")
-            
-            # 生成并发送摊牌图片
-            showdown_image = self.game_manager.generate_showdown_image(group_id)
-            if showdown_image:
-                success = await self.message_service.send_group_image(group_id, showdown_image)
-                if not success:
-                    logger.warning(f"发送摊牌图片失败: {group_id}")
-                    
-        except Exception as e:
-            logger.error(f"发送摊牌结果失败: {e}")
+        # 摊牌图片在渲染线程池中生成，与结果文本的发送并行进行
+        showdown_image, _ = await asyncio.gather(
+            self.game_manager.generate_showdown_image(group_id),
+            self._send_showdown_text(group_id, game)
+        )
+        
+        # 发送摊牌图片（文本之后发送，保持消息顺序）
+        if showdown_image:
+            success = await self.message_service.send_group_image(group_id, showdown_image)
+            if not success:
+                logger.warning(f"发送摊牌图片失败: {group_id}")
+    
+    async def _send_showdown_text(self, group_id: str, game) -> None:
+        """发送摊牌结果文本"""
+        if hasattr(game, 'showdown_results'):
+            result_message = self._build_showdown_message(game)
+            success = await self.message_service.send_group_text(group_id, result_message)
+            if not success:
+                logger.warning(f"发送摊牌结果文本失败: {group_id}")
     
     def _build_action_prompt_message(self, game, active_player) -> str:
         """构建行动提示消息"""
-        from .utils.money_formatter import fmt_chips
-        
-        prompt_parts = [
-            f"🎮 轮到 {active_player.nickname} 行动",
-            f"💰 当前下注: {fmt_chips(game.current_bet)}",
-            f"🎯 可用筹码: {fmt_chips(active_player.chips)}"
-        ]
-        
-        # 添加可用操作提示
-        available_actions = []
-        if active_player.current_bet < game.current_bet:
-            need_amount = game.current_bet - active_player.current_bet
-            available_actions.append(f"跟注 {fmt_chips(need_amount)}")
-        else:
-            available_actions.append("让牌")
+        current_bet = game.current_bet
+        chips = active_player.chips
+        call_amount = current_bet - active_player.current_bet
         
-        available_actions.extend(["加注", "弃牌"])
-        if active_player.chips > 0:
-            available_actions.append("全下")
+        # 按预置模板查表生成可用操作提示
+        needs_call = call_amount > 0
+        available_actions = ACTION_HINTS[needs_call, chips > 0]
+        if needs_call:
+            available_actions = available_actions.format(fmt_chips(call_amount))
         
-        prompt_parts.append(f"📋 可用操作: {' | '.join(available_actions)}")
-        
-        return "\n".join(prompt_parts)
+        return "\n".join((
+            f"🎮 轮到 {active_player.nickname} 行动",
+            f"💰 当前下注: {fmt_chips(current_bet)}",
+            f"🎯 可用筹码: {fmt_chips(chips)}",
+            f"📋 可用操作: {available_actions}"
+        ))
     
     def _build_showdown_message(self, game) -> str:
         """构建摊牌结果消息"""
-        from .utils.money_formatter import fmt_chips
-        
         if not hasattr(game, 'showdown_results'):
             return "🎊 游戏结束！"
         
         results = game.showdown_results
-        message_parts = [
-            "🎊 德州扑克 - 游戏结束！",
-            "=" * 25
-        ]
         
         # 显示所有玩家的手牌
-        message_parts.append("🃏 玩家手牌:")
-        for player, hand_rank, values in results['player_hands']:
-            hand_name = self._get_hand_rank_name(hand_rank)
-            message_parts.append(f"　{player.nickname}: {hand_name}")
+        hand_lines = [
+            f"　{player.nickname}: {self._get_hand_rank_name(hand_rank)}"
+            for player, hand_rank, values in results['player_hands']
+        ]
         
         # 显示获胜者
         winners = results['winners']
+        pot_text = fmt_chips(game.pot)
         if len(winners) == 1:
-            message_parts.extend([
-                "",
-                f"🏆 获胜者: {winners[0].nickname}",
-                f"💰 奖池: {fmt_chips(game.pot)}"
-            ])
+            winner_text = f"🏆 获胜者: {winners[0].nickname}\n💰 奖池: {pot_text}"
         else:
-            winner_names = [w.nickname for w in winners]
-            message_parts.extend([
-                "",
-                f"🏆 并列获胜: {' | '.join(winner_names)}",
-                f"💰 平分奖池: {fmt_chips(game.pot)}"
-            ])
+            winner_text = f"🏆 并列获胜: {' | '.join(w.nickname for w in winners)}\n💰 平分奖池: {pot_text}"
         
-        return "\n".join(message_parts)
+        return "\n".join((SHOWDOWN_HEADER, *hand_lines, "", winner_text))
     
     def _get_hand_rank_name(self, hand_rank) -> str:
         """获取手牌等级的中文名称"""
-        hand_names = {
-            'ROYAL_FLUSH': '皇家同花顺',
-            'STRAIGHT_FLUSH': '同花顺', 
-            'FOUR_OF_A_KIND': '四条',
-            'FULL_HOUSE': '葫芦',
-            'FLUSH': '同花',
-            'STRAIGHT': '顺子',
-            'THREE_OF_A_KIND': '三条',
-            'TWO_PAIR': '两对',
-            'PAIR': '一对',
-            'HIGH_CARD': '高牌'
-        }
-        
         rank_name = hand_rank.name if hasattr(hand_rank, 'name') else str(hand_rank)
-        return hand_names.get(rank_name, rank_name)
+        return HAND_RANK_NAMES.get(rank_name, rank_name)
     
     async def get_plugin_status(self) -> Dict[str, Any]:
         """获取插件状态（用于监控和调试）"""
@@ -367,17 +373,16 @@ class TexasPokerPlugin(Star):
                 'active_games': len(self.game_manager.active_games),
                 'temp_files': sum(len(files) for files in self.game_manager.temp_files.values()),
                 'storage_stats': self.storage.get_storage_statistics(),
-                'memory_usage': await self._get_memory_usage()
+                'memory_usage': self._get_memory_usage()
             }
         except Exception as e:
             logger.error(f"获取插件状态失败: {e}")
             return {'error': str(e)}
     
-    async def _get_memory_usage(self) -> Dict[str, Any]:
+    def _get_memory_usage(self) -> Dict[str, Any]:
         """获取内存使用情况"""
         try:
             import psutil
-            import os
             
             process = psutil.Process(os.getpid())
             memory_info = process.memory_info()
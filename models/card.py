@@ -46,6 +46,18 @@ class Rank(Enum):
     ACE = 14
 
 
+# 牌面大小的显示字符
+RANK_STR = {
+    Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5",
+    Rank.SIX: "6", Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9",
+    Rank.TEN: "10", Rank.JACK: "J", Rank.QUEEN: "Q",
+    Rank.KING: "K", Rank.ACE: "A"
+}
+
+# 52张牌的字符串表示，导入时一次性生成，key为 (花色, 牌面)
+CARD_STR = {(suit, rank): f"{RANK_STR[rank]}{suit.value}" for suit in Suit for rank in Rank}
+
+
 @dataclass
 class Card:
     """
@@ -73,13 +85,7 @@ class Card:
         Returns:
             格式化的牌面字符串，如 "A♠"、"10♥"
         """
-        rank_str = {
-            Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5",
-            Rank.SIX: "6", Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9",
-            Rank.TEN: "10", Rank.JACK: "J", Rank.QUEEN: "Q", 
-            Rank.KING: "K", Rank.ACE: "A"
-        }[self.rank]
-        return f"{rank_str}{self.suit.value}"
+        return CARD_STR[(self.suit, self.rank)]
     
     def __lt__(self, other):
         """比较运算符，用于排序"""
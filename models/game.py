@@ -11,7 +11,7 @@ from typing import List, Dict, Optional, Any, Union, Tuple
 from enum import Enum
 import time
 import uuid
-from .card import Card
+from .card import Card, Deck
 
 
 class GamePhase(Enum):
@@ -158,7 +158,7 @@ class Player:
             'user_id': self.user_id,
             'nickname': self.nickname,
             'chips': self.chips,
-            'hole_cards': [str(card) for card in self.hole_cards],
+            'hole_cards': list(map(str, self.hole_cards)),
             'current_bet': self.current_bet,
             'is_folded': self.is_folded,
             'is_all_in': self.is_all_in,
@@ -176,8 +176,8 @@ class Player:
         player = cls(
             user_id=data['user_id'],
             nickname=data['nickname'],
-            chips=data['chips'],
-            current_bet=data.get('current_bet', 0),
+            chips=data.get('chips') or 0,
+            current_bet=data.get('current_bet') or 0,
             is_folded=data.get('is_folded', False),
             is_all_in=data.get('is_all_in', False),
             position=data.get('position', 0),
@@ -261,6 +261,13 @@ class TexasHoldemGame:
             return self.players[self.active_player_index]
         return None
     
+    def get_blind_indices(self) -> Tuple[int, int]:
+        """获取小盲注和大盲注的座位索引（两人游戏时庄家是小盲注）"""
+        player_count = len(self.players)
+        if player_count == 2:
+            return self.dealer_index, (self.dealer_index + 1) % 2
+        return (self.dealer_index + 1) % player_count, (self.dealer_index + 2) % player_count
+    
     def get_active_players(self) -> List[Player]:
         """获取仍在游戏中的玩家"""
         return [p for p in self.players if not p.is_folded]
@@ -279,21 +286,21 @@ class TexasHoldemGame:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
+        # 每张牌只转换一次字符串，玩家数据与已发牌记录共用
+        players_data = [player.to_dict() for player in self.players]
+        community_cards = list(map(str, self.community_cards))
+        
         # 保存已发牌的状态用于恢复
         dealt_cards = []
         if hasattr(self, '_deck') and self._deck:
-            # 计算已发的牌
-            total_cards = 52
-            remaining_cards = self._deck.remaining_count()
-            dealt_cards_count = total_cards - remaining_cards
-            dealt_cards = [str(card) for player in self.players for card in player.hole_cards]
-            dealt_cards.extend([str(card) for card in self.community_cards])
+            dealt_cards = [card for player_data in players_data for card in player_data['hole_cards']]
+            dealt_cards.extend(community_cards)
         
         return {
             'game_id': self.game_id,
             'group_id': self.group_id,
-            'players': [player.to_dict() for player in self.players],
-            'community_cards': [str(card) for card in self.community_cards],
+            'players': players_data,
+            'community_cards': community_cards,
             'pot': self.pot,
             'side_pots': self.side_pots,
             'current_bet': self.current_bet,
@@ -314,13 +321,13 @@ class TexasHoldemGame:
         game = cls(
             game_id=data['game_id'],
             group_id=data['group_id'],
-            pot=data.get('pot', 0),
+            pot=data.get('pot') or 0,
             side_pots=data.get('side_pots', []),
-            current_bet=data.get('current_bet', 0),
+            current_bet=data.get('current_bet') or 0,
             active_player_index=data.get('active_player_index', 0),
             dealer_index=data.get('dealer_index', 0),
-            small_blind=data.get('small_blind', 1),
-            big_blind=data.get('big_blind', 2),
+            small_blind=data.get('small_blind') or 1,
+            big_blind=data.get('big_blind') or 2,
             created_at=data.get('created_at', int(time.time())),
             last_action_time=data.get('last_action_time', int(time.time())),
             timeout_seconds=data.get('timeout_seconds', 30)
@@ -334,30 +341,17 @@ class TexasHoldemGame:
         
         # 恢复时重新创建牌组，排除已发的牌
         if data.get('phase') != 'waiting':
-            from .card import Card, Suit, Rank, Deck
             game._deck = Deck()
             
             # 如果有已发牌记录，从牌组中移除
             dealt_cards = data.get('dealt_cards', [])
             if dealt_cards:
-                # 创建已发牌的Card对象
-                dealt_card_objects = []
-                for card_str in dealt_cards:
-                    try:
-                        # 解析牌面字符串，如"A♠"
-                        if len(card_str) >= 2:
-                            rank_str = card_str[:-1]
-                            suit_str = card_str[-1]
-                            
-                            # 查找对应的牌并移除
-                            for card in game._deck.cards[:]:
-                                if str(card) == card_str:
-                                    game._deck.cards.remove(card)
-                                    dealt_card_objects.append(card)
-                                    break
-                    except:
-                        pass  # 忽略解析错误
+                # 按牌面字符串一次性过滤已发的牌
+                dealt_set = set(dealt_cards)
+                remaining = [card for card in game._deck.cards if str(card) not in dealt_set]
+                excluded_count = len(game._deck.cards) - len(remaining)
+                game._deck.cards = remaining
                 
-                logger.debug(f"游戏恢复: 排除了 {len(dealt_card_objects)} 张已发的牌")
+                logger.debug(f"游戏恢复: 排除了 {excluded_count} 张已发的牌")
         
         return game
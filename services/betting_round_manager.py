@@ -5,11 +5,26 @@
 - 下注轮状态判断
 - 行动处理
 """
+import time
 from typing import List, Tuple, Optional, Dict, Any
 from ..models.game import TexasHoldemGame, Player, PlayerAction, GamePhase
 from astrbot.api import logger
 
 
+# 允许下注行动的游戏阶段
+BETTING_PHASES = frozenset((GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER))
+
+# 行动别名 -> 标准行动名
+ACTION_ALIASES = {
+    '弃牌': 'fold',
+    '让牌': 'check',
+    '跟注': 'call',
+    '加注': 'raise',
+    '全下': 'all_in',
+    'allin': 'all_in'
+}
+
+
 class BettingRoundManager:
     """下注轮管理器
     
@@ -31,13 +46,13 @@ class BettingRoundManager:
     
     def process_action(self, game: TexasHoldemGame, player: Player, action: str, amount: int = 0) -> Tuple[bool, str]:
         """处理玩家行动"""
-        # 验证基本条件
-        if not self._can_player_act(game, player):
-            return False, self._get_action_error_message(game, player)
+        # 验证基本条件（当前行动玩家只解析一次，校验和错误提示共用）
+        active_player = game.get_active_player()
+        if not self._can_player_act(game, player, active_player):
+            return False, self._get_action_error_message(player, active_player)
         
-        # 处理具体行动
-        action_key = self._normalize_action(action)
-        handler = self.action_handlers.get(action_key)
+        # 处理具体行动：命令层传入的是标准行动名，直接查表；其他写法再做标准化
+        handler = self.action_handlers.get(action) or self.action_handlers.get(self._normalize_action(action))
         
         if not handler:
             return False, "无效的行动类型"
@@ -46,7 +61,7 @@ class BettingRoundManager:
             success, message = handler(game, player, amount)
             if success:
                 player.has_acted_this_round = True
-                game.last_action_time = int(__import__('time').time())
+                game.last_action_time = int(time.time())
                 logger.debug(f"玩家 {player.nickname} 执行行动: {action}")
             return success, message
         except Exception as e:
@@ -67,9 +82,15 @@ class BettingRoundManager:
         
         return None  # 没有玩家需要行动
     
-    def is_betting_round_complete(self, game: TexasHoldemGame) -> bool:
-        """判断下注轮是否结束"""
-        active_players = [p for p in game.players if not p.is_folded]
+    def is_betting_round_complete(self, game: TexasHoldemGame,
+                                  active_players: Optional[List[Player]] = None) -> bool:
+        """判断下注轮是否结束
+        
+        Args:
+            active_players: 调用方已算好的未弃牌玩家列表（可选），避免重复过滤
+        """
+        if active_players is None:
+            active_players = game.get_active_players()
         
         # 只剩一个玩家，游戏结束
         if len(active_players) <= 1:
@@ -91,7 +112,7 @@ class BettingRoundManager:
     
     def get_available_actions(self, game: TexasHoldemGame, player: Player) -> List[str]:
         """获取玩家可用的行动列表"""
-        if not self._can_player_act(game, player):
+        if not self._can_player_act(game, player, game.get_active_player()):
             return []
         
         actions = []
@@ -119,20 +140,19 @@ class BettingRoundManager:
         
         return actions
     
-    def _can_player_act(self, game: TexasHoldemGame, player: Player) -> bool:
+    def _can_player_act(self, game: TexasHoldemGame, player: Player,
+                        active_player: Optional[Player]) -> bool:
         """检查玩家是否可以行动"""
         # 基本状态检查
         if player.is_folded or player.is_all_in:
             return False
         
         # 检查是否是该玩家的回合
-        active_player = game.get_active_player()
         if not active_player or active_player.user_id != player.user_id:
             return False
         
         # 检查游戏阶段
-        valid_phases = [GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER]
-        return game.phase in valid_phases
+        return game.phase in BETTING_PHASES
     
     def _player_needs_action(self, player: Player, game: TexasHoldemGame) -> bool:
         """判断玩家是否需要行动"""
@@ -149,14 +169,13 @@ class BettingRoundManager:
         
         return False
     
-    def _get_action_error_message(self, game: TexasHoldemGame, player: Player) -> str:
+    def _get_action_error_message(self, player: Player, active_player: Optional[Player]) -> str:
         """获取行动错误消息"""
         if player.is_folded:
             return "您已弃牌，无法行动"
         if player.is_all_in:
             return "您已全下，无法继续行动"
         
-        active_player = game.get_active_player()
         if not active_player or active_player.user_id != player.user_id:
             current_name = active_player.nickname if active_player else "无"
             return f"现在是 {current_name} 的回合，请等待"
@@ -165,15 +184,8 @@ class BettingRoundManager:
     
     def _normalize_action(self, action: str) -> str:
         """标准化行动名称"""
-        action_map = {
-            '弃牌': 'fold',
-            '让牌': 'check', 
-            '跟注': 'call',
-            '加注': 'raise',
-            '全下': 'all_in',
-            'allin': 'all_in'
-        }
-        return action_map.get(action.lower().strip(), action.lower().strip())
+        action = action.lower().strip()
+        return ACTION_ALIASES.get(action, action)
     
     def _handle_fold(self, game: TexasHoldemGame, player: Player, amount: int) -> Tuple[bool, str]:
         """处理弃牌"""
@@ -10,12 +10,108 @@ from astrbot.api import logger
 from ..services.game_manager import GameManager
 from ..services.player_service import PlayerService
 from ..utils.storage_manager import StorageManager
+from ..utils.config_service import PluginConfig
 from ..utils.user_isolation import UserIsolation
 from ..utils.decorators import command_error_handler
 from ..utils.money_formatter import fmt_chips, fmt_balance, fmt_error
 from ..utils.error_handler import ValidationError, GameError
 
 
+# 游戏阶段的中文显示名称
+PHASE_DISPLAY = {
+    "waiting": "等待玩家",
+    "pre_flop": "翻牌前",
+    "flop": "翻牌圈",
+    "turn": "转牌圈", 
+    "river": "河牌圈",
+    "showdown": "摊牌中"
+}
+
+# 服务层未给出失败原因时的默认提示
+DEFAULT_ERROR_REASON = "系统错误"
+UNKNOWN_ERROR_REASON = "未知错误"
+
+# 需要推送公共牌图片的阶段
+BOARD_PHASES = frozenset(("flop", "turn", "river"))
+
+# 玩家状态图标
+STATUS_ICON_DEALER = "🎯庄"
+STATUS_ICON_FOLDED = "❌弃牌"
+STATUS_ICON_ALL_IN = "🎯全下"
+
+# 玩家状态标签，key 为 (是否庄家, 弃牌/全下图标)，导入时一次性拼好
+STATUS_TAGS = {
+    (is_dealer, icon): f" [{' '.join(filter(None, (STATUS_ICON_DEALER if is_dealer else '', icon)))}]"
+    if is_dealer or icon else ""
+    for is_dealer in (False, True)
+    for icon in ("", STATUS_ICON_FOLDED, STATUS_ICON_ALL_IN)
+}
+
+# 无排行数据时的文本（内容固定，预先拼接）
+EMPTY_RANKING_TEXT = "\n".join([
+    "🏆 德州扑克排行榜",
+    "=" * 30,
+    "",
+    "📊 暂无排行数据",
+    "",
+    "💡 开始游戏来建立您的战绩：",
+    "• 使用 /德州注册 注册账户",
+    "• 使用 /德州创建 创建游戏",
+    "• 赢得游戏来提升排名！"
+])
+
+# 游戏开始消息中的座位标记
+SEAT_TAG_DEALER = " [庄家🎯]"
+SEAT_TAG_SMALL_BLIND = " [小盲👤]"
+SEAT_TAG_BIG_BLIND = " [大盲👤]"
+
+# 游戏开始消息的固定结尾
+GAME_START_FOOTER = "\n".join(["", "🃏 每位玩家已收到私聊手牌消息", "🎲 祝各位游戏愉快！"])
+
+# 排行榜前三名奖牌
+MEDAL_ICONS = ("🥇", "🥈", "🥉")
+
+# 排行榜前十名的名次图标
+RANK_ICONS = MEDAL_ICONS + ("🌟", "🌟") + tuple(f"{i:2d}." for i in range(6, 11))
+
+# 排行榜标题与说明（内容固定，预先拼接）
+RANKING_HEADER = "\n".join(["🏆 德州扑克排行榜", "=" * 30, ""])
+RANKING_FOOTER = "\n".join([
+    "📊 排名说明:",
+    "• 💰 总盈利：累计盈亏金额",
+    "• 🎮 游戏局数：参与的总游戏数",
+    "• 🏆 胜利场次：获胜的手牌数",
+    "• 📊 胜率：获胜率百分比",
+    "",
+    "💡 提示: 定期更新，最多显示前10名"
+])
+
+# 无游戏时的状态文本（内容固定，预先拼接）
+NO_GAME_TEXT = "\n".join([
+    "📊 游戏状态查询",
+    "=" * 25,
+    "",
+    "❌ 当前没有进行中的游戏",
+    "",
+    "🎮 开始新游戏:",
+    "• 使用 /德州创建 创建游戏房间",
+    "• 使用 /德州注册 注册账户(如需要)",
+    "• 使用 /德州帮助 查看完整指令"
+])
+
+# 游戏已结束时的状态文本（内容固定，预先拼接）
+GAME_FINISHED_TEXT = "\n".join([
+    "📊 游戏状态查询",
+    "=" * 25,
+    "",
+    "✅ 上一局游戏已结束",
+    "",
+    "🎮 开始新游戏:",
+    "• 使用 /德州创建 创建新的游戏房间",
+    "• 使用 /德州排行 查看战绩排名"
+])
+
+
 class CommandHandler:
     """
     德州扑克命令处理器
@@ -33,6 +129,10 @@ class CommandHandler:
         self.player_service = player_service
         self.game_manager = game_manager
         
+        # 帮助文本缓存，配置快照变化时重新生成
+        self._help_text: Optional[str] = None
+        self._help_text_config: Optional[PluginConfig] = None
+        
         logger.info("命令处理器初始化完成")
     
     @command_error_handler("玩家注册")
@@ -50,7 +150,7 @@ class CommandHandler:
             return
         
         # 获取初始筹码配置
-        initial_chips = self.storage.get_plugin_config_value('default_chips', 500)
+        initial_chips = self.storage.get_plugin_config().default_chips
         
         # 注册新玩家
         success, message = self.player_service.register_player(user_id, nickname, initial_chips)
@@ -61,7 +161,7 @@ class CommandHandler:
         else:
             error_msg = fmt_error(
                 "玩家注册失败",
-                str(message) if message else "系统错误",
+                message or DEFAULT_ERROR_REASON,
                 ["请检查网络连接", "稍后重试", "联系管理员"]
             )
             yield event.plain_result("\n".join(error_msg))
@@ -70,9 +170,8 @@ class CommandHandler:
     async def create_game(self, event: AstrMessageEvent, small_blind: int = None, 
                          big_blind: int = None) -> AsyncGenerator[MessageEventResult, None]:
         """创建德州扑克游戏"""
-        user_id = UserIsolation.get_isolated_user_id(event)
+        user_id, group_id = UserIsolation.get_event_ids(event)
         nickname = event.get_sender_name()
-        group_id = event.get_group_id() or user_id
         
         # 创建游戏
         success, message, game = self.game_manager.create_game(
@@ -85,7 +184,7 @@ class CommandHandler:
         else:
             error_msg = fmt_error(
                 "游戏创建失败",
-                str(message) if message else "系统错误",
+                message or DEFAULT_ERROR_REASON,
                 [
                     "检查玩家是否已注册",
                     "确认盲注设置合理",
@@ -97,13 +196,12 @@ class CommandHandler:
     @command_error_handler("加入游戏")
     async def join_game(self, event: AstrMessageEvent, buyin: int = None) -> AsyncGenerator[MessageEventResult, None]:
         """加入德州扑克游戏"""
-        user_id = UserIsolation.get_isolated_user_id(event)
+        user_id, group_id = UserIsolation.get_event_ids(event)
         nickname = event.get_sender_name()
-        group_id = event.get_group_id() or user_id
         
         # 如果没有指定买入金额，使用默认值
         if buyin is None:
-            buyin = self.storage.get_plugin_config_value('default_buyin', 50)
+            buyin = self.storage.get_plugin_config().default_buyin
         
         # 验证买入金额范围
         self._validate_buyin_range(buyin)
@@ -119,7 +217,7 @@ class CommandHandler:
         else:
             error_msg = fmt_error(
                 "加入游戏失败",
-                str(message) if message else "系统错误",
+                message or DEFAULT_ERROR_REASON,
                 [
                     "确认游戏房间已创建",
                     "检查买入金额是否合适",
@@ -132,26 +230,26 @@ class CommandHandler:
     @command_error_handler("开始游戏")
     async def start_game(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
         """开始德州扑克游戏"""
-        user_id = UserIsolation.get_isolated_user_id(event)
-        group_id = event.get_group_id() or user_id
+        user_id, group_id = UserIsolation.get_event_ids(event)
+        manager = self.game_manager
         
-        success, message = await self.game_manager.start_game(group_id, user_id)
+        success, message = await manager.start_game(group_id, user_id)
         
         if success:
             # 发送游戏开始信息
-            start_info = self._build_game_start_message(group_id)
-            if start_info:
-                yield event.plain_result(start_info)
+            game = manager.get_game_state(group_id)
+            if game:
+                yield event.plain_result(self._build_game_start_message(game))
             
             # 发送公共牌图片
-            community_image = self.game_manager.generate_community_image(group_id)
+            community_image = await manager.generate_community_image(group_id)
             if community_image:
                 yield event.image_result(community_image)
         else:
             error_msg = [
                 "❌ 游戏开始失败",
                 "",
-                f"🔍 失败原因: {str(message) if message else '未知错误'}",
+                f"🔍 失败原因: {message or UNKNOWN_ERROR_REASON}",
                 "",
                 "💡 可能的解决方案:",
                 "• 检查是否有足够的玩家加入",
@@ -164,57 +262,36 @@ class CommandHandler:
     async def show_game_status(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
         """显示游戏状态"""
         group_id = event.get_group_id() or UserIsolation.get_isolated_user_id(event)
-        game = self.game_controller.get_game_state(group_id)
+        manager = self.game_manager
+        game = manager.get_game_state(group_id)
         
         if not game:
-            no_game_msg = self._build_no_game_message()
-            yield event.plain_result("\n".join(no_game_msg))
+            yield event.plain_result(NO_GAME_TEXT)
             return
         
         # 检查游戏是否已结束，如果是则清理
         if game.phase.value == "finished":
-            await self.game_manager._cleanup_game_resources(group_id)
-            finished_msg = self._build_game_finished_message()
-            yield event.plain_result("\n".join(finished_msg))
+            await manager._cleanup_game_resources(group_id)
+            yield event.plain_result(GAME_FINISHED_TEXT)
             return
         
         # 构建详细的状态信息
-        status_lines = self._build_detailed_game_status(game)
-        yield event.plain_result("\n".join(status_lines))
+        yield event.plain_result(self._build_detailed_game_status(game))
     
     async def handle_player_action(self, event: AstrMessageEvent, action: str, 
                                   amount: int = 0) -> AsyncGenerator[MessageEventResult, None]:
-        """处理玩家行动的通用方法"""
-        user_id = UserIsolation.get_isolated_user_id(event)
-        group_id = event.get_group_id() or user_id
+        """处理玩家行动的通用方法（行动结果先行发送，公共牌/摊牌图片渲染完成后再发送）"""
+        user_id, group_id = UserIsolation.get_event_ids(event)
+        manager = self.game_manager
         
-        success, message = await self.game_manager.player_action(
+        success, message = await manager.player_action(
             group_id, user_id, action, amount
         )
         
-        if success:
-            # 构建行动结果消息
-            result_msg = self._build_action_result_message(message, None)
-            yield event.plain_result(result_msg)
-            
-            # 根据游戏阶段有选择地生成图片
-            game = self.game_manager.get_game_state(group_id)
-            if game:
-                # 只在阶段变更或摊牌时生成公共牌图片
-                if game.phase.value in ["flop", "turn", "river"]:
-                    community_image = self.game_manager.generate_community_image(group_id)
-                    if community_image:
-                        yield event.image_result(community_image)
-                
-                # 只在摊牌阶段生成摊牌图片
-                if game.phase.value == "showdown":
-                    showdown_image = self.game_manager.generate_showdown_image(group_id)
-                    if showdown_image:
-                        yield event.image_result(showdown_image)
-        else:
+        if not success:
             error_msg = fmt_error(
                 "游戏操作失败",
-                str(message) if message else "系统错误",
+                message or DEFAULT_ERROR_REASON,
                 [
                     "检查是否轮到您行动",
                     "确认操作参数正确",
@@ -222,6 +299,27 @@ class CommandHandler:
                 ]
             )
             yield event.plain_result("\n".join(error_msg))
+            return
+        
+        # 行动结果只作为一条文本消息发送，图片按阶段单独发送
+        yield event.plain_result(self._build_action_result_message(message, None))
+        
+        game = manager.get_game_state(group_id)
+        if not game:
+            return
+        
+        phase = game.phase.value
+        if phase in BOARD_PHASES:
+            # 翻牌、转牌、河牌阶段推送公共牌图片
+            image_path = await manager.generate_community_image(group_id)
+        elif phase == "showdown":
+            # 摊牌阶段推送摊牌图片
+            image_path = await manager.generate_showdown_image(group_id)
+        else:
+            image_path = None
+        
+        if image_path:
+            yield event.image_result(image_path)
     
     @command_error_handler("查询余额")
     async def show_balance(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
@@ -251,25 +349,17 @@ class CommandHandler:
     async def show_ranking(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
         """显示排行榜"""
         group_id = event.get_group_id() or UserIsolation.get_isolated_user_id(event)
-        ranking = self.storage.get_group_ranking(group_id, 10)
-        
-        if not ranking:
-            ranking_msg = self._build_empty_ranking_message()
-            yield event.plain_result("\n".join(ranking_msg))
-            return
-        
-        ranking_msg = self._build_ranking_message(ranking)
-        yield event.plain_result("\n".join(ranking_msg))
+        yield event.plain_result(self._build_ranking_text(group_id))
     
     async def show_help(self, event: AstrMessageEvent) -> AsyncGenerator[MessageEventResult, None]:
         """显示帮助信息"""
-        help_msg = self._build_help_message()
-        yield event.plain_result("\n".join(help_msg))
+        yield event.plain_result(self._get_help_text())
     
     def _validate_buyin_range(self, buyin: int) -> None:
         """验证买入金额范围"""
-        min_buyin = self.storage.get_plugin_config_value('min_buyin', 10)
-        max_buyin = self.storage.get_plugin_config_value('max_buyin', 200)
+        cfg = self.storage.get_plugin_config()
+        min_buyin = cfg.min_buyin
+        max_buyin = cfg.max_buyin
         
         if buyin < min_buyin:
             raise ValidationError(f"买入金额过少，最少需要 {fmt_chips(min_buyin)}")
@@ -316,11 +406,12 @@ class CommandHandler:
     
     def _build_game_creation_message(self, game) -> list:
         """构建游戏创建成功消息"""
-        max_players = self.storage.get_plugin_config_value('max_players', 9)
-        min_players = self.storage.get_plugin_config_value('min_players', 2)
-        default_buyin = self.storage.get_plugin_config_value('default_buyin', 50)
-        min_buyin = self.storage.get_plugin_config_value('min_buyin', 10)
-        max_buyin = self.storage.get_plugin_config_value('max_buyin', 200)
+        cfg = self.storage.get_plugin_config()
+        max_players = cfg.max_players
+        min_players = cfg.min_players
+        default_buyin = cfg.default_buyin
+        min_buyin = cfg.min_buyin
+        max_buyin = cfg.max_buyin
         
         return [
             f"🎮 德州扑克房间创建成功！",
@@ -349,8 +440,9 @@ class CommandHandler:
         if not game:
             return [f"✅ {nickname} 成功加入游戏！"]
         
-        max_players = self.storage.get_plugin_config_value('max_players', 9)
-        min_players = self.storage.get_plugin_config_value('min_players', 2)
+        cfg = self.storage.get_plugin_config()
+        max_players = cfg.max_players
+        min_players = cfg.min_players
         current_count = len(game.players)
         
         msg = [
@@ -379,112 +471,78 @@ class CommandHandler:
         
         return msg
     
-    def _build_game_start_message(self, group_id: str) -> Optional[str]:
+    def _build_game_start_message(self, game) -> str:
         """构建游戏开始消息"""
-        game = self.game_manager.get_game_state(group_id)
-        if not game:
-            return None
-        
-        message_parts = [
-            "🎮 德州扑克游戏开始！",
-            "",
-            f"🆔 游戏ID: {game.game_id}",
-            f"💰 盲注设置:",
-            f"  小盲注: {fmt_chips(game.small_blind)}",
-            f"  大盲注: {fmt_chips(game.big_blind)}",
-            "",
-            f"👥 玩家座次 ({len(game.players)}人):"
-        ]
+        players = game.players
+        
+        # 座位标记只计算一次，循环内直接查表
+        small_blind_idx, big_blind_idx = game.get_blind_indices()
+        seat_tags = {small_blind_idx: SEAT_TAG_SMALL_BLIND, big_blind_idx: SEAT_TAG_BIG_BLIND}
+        seat_tags[game.dealer_index] = SEAT_TAG_DEALER + seat_tags.get(game.dealer_index, "")
+        
+        header = (
+            f"🎮 德州扑克游戏开始！\n"
+            f"\n"
+            f"🆔 游戏ID: {game.game_id}\n"
+            f"💰 盲注设置:\n"
+            f"  小盲注: {fmt_chips(game.small_blind)}\n"
+            f"  大盲注: {fmt_chips(game.big_blind)}\n"
+            f"\n"
+            f"👥 玩家座次 ({len(players)}人):"
+        )
         
         # 显示玩家座次和筹码
-        for i, player in enumerate(game.players):
-            chips_text = fmt_chips(player.chips)
-            position_text = ""
-            if i == game.dealer_index:
-                position_text += " [庄家🎯]"
-            
-            message_parts.append(f"  {i+1}. {player.nickname} - 筹码: {chips_text}{position_text}")
-        
-        message_parts.extend([
-            "",
-            "🃏 每位玩家已收到私聊手牌消息",
-            "🎲 祝各位游戏愉快！"
-        ])
-        
-        return "\n".join(message_parts)
-    
-    def _build_no_game_message(self) -> list:
-        """构建无游戏消息"""
-        return [
-            "📊 游戏状态查询",
-            "=" * 25,
-            "",
-            "❌ 当前没有进行中的游戏",
-            "",
-            "🎮 开始新游戏:",
-            "• 使用 /德州创建 创建游戏房间",
-            "• 使用 /德州注册 注册账户(如需要)",
-            "• 使用 /德州帮助 查看完整指令"
-        ]
-    
-    def _build_game_finished_message(self) -> list:
-        """构建游戏结束消息"""
-        return [
-            "📊 游戏状态查询",
-            "=" * 25,
-            "",
-            "✅ 上一局游戏已结束",
-            "",
-            "🎮 开始新游戏:",
-            "• 使用 /德州创建 创建新的游戏房间",
-            "• 使用 /德州排行 查看战绩排名"
+        player_lines = [
+            f"  {i+1}. {player.nickname} - 筹码: {fmt_chips(player.chips)}{seat_tags.get(i, '')}"
+            for i, player in enumerate(players)
         ]
+        
+        return "\n".join((header, *player_lines, GAME_START_FOOTER))
     
-    def _build_detailed_game_status(self, game) -> list:
-        """构建详细游戏状态"""
-        phase_display = {
-            "waiting": "等待玩家",
-            "pre_flop": "翻牌前",
-            "flop": "翻牌圈",
-            "turn": "转牌圈", 
-            "river": "河牌圈",
-            "showdown": "摊牌中"
-        }
+    def _build_detailed_game_status(self, game) -> str:
+        """构建详细游戏状态文本"""
+        phase = game.phase.value
+        players = game.players
+        dealer = game.dealer_index
+        cur_bet = game.current_bet
         
         status_lines = [
             f"🎮 德州扑克游戏状态",
             "=" * 35,
             "",
             f"🆔 游戏ID: {game.game_id}",
-            f"🎯 当前阶段: {phase_display.get(game.phase.value, game.phase.value.upper())}",
+            f"🎯 当前阶段: {PHASE_DISPLAY.get(phase, phase.upper())}",
             f"💰 当前底池: {fmt_chips(game.pot)}",
-            f"📈 当前下注额: {fmt_chips(game.current_bet) if game.current_bet > 0 else '无'}",
+            f"📈 当前下注额: {fmt_chips(cur_bet) if cur_bet > 0 else '无'}",
             f"🔵 小盲注: {fmt_chips(game.small_blind)} | 🔴 大盲注: {fmt_chips(game.big_blind)}",
             "",
-            f"👥 玩家信息 ({len(game.players)}人):"
+            f"👥 玩家信息 ({len(players)}人):"
         ]
         
+        # 等待阶段尚未发牌，庄家/弃牌/全下标记均无意义，跳过图标计算
+        show_icons = phase != "waiting"
+        
         # 详细玩家信息
-        for i, player in enumerate(game.players):
-            status_icons = []
-            if i == game.dealer_index:
-                status_icons.append("🎯庄")
-            if player.is_folded:
-                status_icons.append("❌弃牌")
-            elif player.is_all_in:
-                status_icons.append("🎯全下")
-            
-            status_text = f" [{' '.join(status_icons)}]" if status_icons else ""
-            
-            player_line = f"  {i+1}. {player.nickname}{status_text}"
-            detail_line = f"      💼 筹码: {fmt_chips(player.chips)}"
-            
-            if player.current_bet > 0:
-                detail_line += f" | 💸 已下注: {fmt_chips(player.current_bet)}"
-            
-            status_lines.extend([player_line, detail_line, ""])
+        for i, player in enumerate(players):
+            status_lines += self._format_player_rows(i, player, show_icons and i == dealer, show_icons)
         
-        return status_lines
+        return "\n".join(status_lines)
+    
+    @staticmethod
+    def _format_player_rows(index: int, player, is_dealer: bool, show_icons: bool) -> Tuple[str, str, str]:
+        """格式化状态消息中单个玩家的行（状态标签查表获得）"""
+        status_text = ""
+        if show_icons:
+            icon = STATUS_ICON_FOLDED if player.is_folded else STATUS_ICON_ALL_IN if player.is_all_in else ""
+            status_text = STATUS_TAGS[is_dealer, icon]
+        
+        bet = player.current_bet
+        bet_text = f" | 💸 已下注: {fmt_chips(bet)}" if bet > 0 else ""
+        return (
+            f"  {index + 1}. {player.nickname}{status_text}",
+            f"      💼 筹码: {fmt_chips(player.chips)}{bet_text}",
+            ""
+        )
     
     def _build_action_result_message(self, message: str, result_data: Optional[Dict[str, Any]]) -> str:
         """构建行动结果消息"""
@@ -492,10 +550,11 @@ class CommandHandler:
         
         if result_data and result_data.get('game_info'):
             game_info = result_data['game_info']
+            current_bet = game_info.get('current_bet') or 0
             parts.extend([
                 "",
-                f"💰 当前底池: {fmt_chips(game_info.get('pot', 0))}",
-                f"📈 当前下注额: {fmt_chips(game_info.get('current_bet', 0)) if game_info.get('current_bet', 0) > 0 else '无'}"
+                f"💰 当前底池: {fmt_chips(game_info.get('pot') or 0)}",
+                f"📈 当前下注额: {fmt_chips(current_bet) if current_bet > 0 else '无'}"
             ])
             
             if game_info.get('active_player'):
@@ -506,76 +565,54 @@ class CommandHandler:
         
         return "\n".join(parts)
     
-    def _build_empty_ranking_message(self) -> list:
-        """构建空排行榜消息"""
-        return [
-            "🏆 德州扑克排行榜",
-            "=" * 30,
-            "",
-            "📊 暂无排行数据",
-            "",
-            "💡 开始游戏来建立您的战绩：",
-            "• 使用 /德州注册 注册账户",
-            "• 使用 /德州创建 创建游戏",
-            "• 赢得游戏来提升排名！"
-        ]
+    def _build_ranking_text(self, group_id: str) -> str:
+        """构建排行榜文本（同步完成，命令协程只负责发送）"""
+        ranking = self.storage.get_group_ranking(group_id, 10)
+        if not ranking:
+            return EMPTY_RANKING_TEXT
+        return self._build_ranking_message(ranking)
     
-    def _build_ranking_message(self, ranking: list) -> list:
+    def _build_ranking_message(self, ranking: list) -> str:
         """构建排行榜消息"""
-        ranking_msg = [
-            "🏆 德州扑克排行榜",
-            "=" * 30,
-            ""
-        ]
-        
-        medal_icons = ["🥇", "🥈", "🥉"]
-        
-        for i, player_data in enumerate(ranking, 1):
-            nickname = player_data.get('nickname', '未知')
-            winnings = player_data.get('total_winnings', 0)
-            games = player_data.get('games_played', 0)
-            hands_won = player_data.get('hands_won', 0)
-            
-            win_rate = round((hands_won / games * 100) if games > 0 else 0, 1)
-            
-            if i <= 3:
-                rank_icon = medal_icons[i-1]
-            elif i <= 5:
-                rank_icon = "🌟"
-            else:
-                rank_icon = f"{i:2d}."
-            
-            winnings_text = fmt_chips(winnings) if winnings != 0 else "±0"
-            if winnings > 0:
-                winnings_display = f"💚 +{winnings_text}"
-            elif winnings < 0:
-                winnings_display = f"💸 {winnings_text}"
-            else:
-                winnings_display = f"⚪ {winnings_text}"
-            
-            player_line = f"{rank_icon} {nickname}"
-            stats_line = f"    💰 {winnings_display} | 🎮 {games}局 | 🏆 {hands_won}胜 | 📊 {win_rate}%"
-            
-            ranking_msg.extend([player_line, stats_line, ""])
-        
-        ranking_msg.extend([
-            "📊 排名说明:",
-            "• 💰 总盈利：累计盈亏金额",
-            "• 🎮 游戏局数：参与的总游戏数",
-            "• 🏆 胜利场次：获胜的手牌数",
-            "• 📊 胜率：获胜率百分比",
-            "",
-            "💡 提示: 定期更新，最多显示前10名"
-        ])
+        rows = [self._format_ranking_row(i, player_data) for i, player_data in enumerate(ranking, 1)]
+        return "\n".join((RANKING_HEADER, *rows, RANKING_FOOTER))
+    
+    @staticmethod
+    def _format_ranking_row(rank: int, player_data: Dict[str, Any]) -> str:
+        """格式化单个玩家的排行榜条目（名次行 + 统计行 + 空行）"""
+        get = player_data.get
+        nickname = get('nickname', '未知')
+        winnings = get('total_winnings', 0)
+        games = get('games_played', 0)
+        hands_won = get('hands_won', 0)
+        
+        win_rate = round((hands_won / games * 100) if games > 0 else 0, 1)
+        rank_icon = RANK_ICONS[rank - 1] if rank <= len(RANK_ICONS) else f"{rank:2d}."
+        
+        if winnings > 0:
+            winnings_display = f"💚 +{fmt_chips(winnings)}"
+        elif winnings < 0:
+            winnings_display = f"💸 {fmt_chips(winnings)}"
+        else:
+            winnings_display = "⚪ ±0"
         
-        return ranking_msg
+        return (f"{rank_icon} {nickname}\n"
+                f"    💰 {winnings_display} | 🎮 {games}局 | 🏆 {hands_won}胜 | 📊 {win_rate}%\n")
+    
+    def _get_help_text(self) -> str:
+        """获取帮助文本，仅在配置快照变化时重新生成"""
+        cfg = self.storage.get_plugin_config()
+        if self._help_text is None or cfg is not self._help_text_config:
+            self._help_text = "\n".join(self._build_help_message(cfg))
+            self._help_text_config = cfg
+        return self._help_text
     
-    def _build_help_message(self) -> list:
+    def _build_help_message(self, cfg: PluginConfig) -> list:
         """构建帮助消息"""
-        default_chips = self.storage.get_plugin_config_value('default_chips', 500)
-        default_buyin = self.storage.get_plugin_config_value('default_buyin', 50)
-        min_buyin = self.storage.get_plugin_config_value('min_buyin', 10)
-        max_buyin = self.storage.get_plugin_config_value('max_buyin', 200)
+        default_chips = cfg.default_chips
+        default_buyin = cfg.default_buyin
+        min_buyin = cfg.min_buyin
+        max_buyin = cfg.max_buyin
         
         return [
             "🃏 德州扑克插件 - 完整指令手册",
@@ -7,17 +7,36 @@
 - 超时处理
 """
 import asyncio
+import os
 import time
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Any, Callable
 from ..models.game import TexasHoldemGame, Player, GamePhase
 from ..services.game_state_machine import GameStateMachine
-from ..services.betting_round_manager import BettingRoundManager
+from ..services.betting_round_manager import BettingRoundManager, BETTING_PHASES
 from ..services.player_service import PlayerService
 from ..services.renderer import PokerRenderer
 from ..utils.storage_manager import StorageManager
+from ..utils.async_utils import create_eager_task
 from astrbot.api import logger
 
 
+# 渲染线程池大小：PIL 绘制与编码期间释放 GIL，按 CPU 核数并行
+RENDER_POOL_WORKERS = os.cpu_count() or 4
+
+# 启动时恢复游戏的最长耗时（秒）
+RESTORE_TIMEOUT = 10
+
+# 定期清理临时图片的间隔与最长保留时间（秒），防止中途废弃的游戏遗留文件
+TEMP_CLEANUP_INTERVAL = 300
+TEMP_FILE_MAX_AGE = 3600
+
+# 单个群组登记的临时图片上限，超出时最早的文件被删除，防止长期运行的群组无限累积
+TEMP_FILES_PER_GROUP = 128
+
+
 class GameManager:
     """德州扑克游戏管理器
     
@@ -33,6 +52,9 @@ class GameManager:
         self.player_service = player_service
         self.renderer = PokerRenderer()
         
+        # 图片渲染专用线程池，避免 PIL 绘制和编码阻塞事件循环
+        self._render_pool = ThreadPoolExecutor(max_workers=RENDER_POOL_WORKERS, thread_name_prefix="poker-render")
+        
         # 核心组件
         self.state_machine = GameStateMachine()
         self.betting_manager = BettingRoundManager()
@@ -40,7 +62,13 @@ class GameManager:
         # 游戏实例管理
         self.active_games: Dict[str, TexasHoldemGame] = {}
         self.timeout_tasks: Dict[str, asyncio.Task] = {}
-        self.temp_files: Dict[str, List[str]] = {}
+        # 当前行动者的超时等待事件：置位即结束等待，计时任务随之自然退出
+        self.action_events: Dict[str, asyncio.Event] = {}
+        # 临时图片登记：群组 -> {文件路径: None}，dict 作为有序集合，按登记顺序淘汰
+        self.temp_files: Dict[str, Dict[str, None]] = defaultdict(dict)
+        # 已渲染图片缓存：群组 -> {图片类型: (内容键, 文件路径)}，画面内容未变时直接复用
+        self.rendered_images: Dict[str, Dict[str, Tuple[tuple, str]]] = defaultdict(dict)
+        self._cleanup_task: Optional[asyncio.Task] = None
         
         # 并发控制
         self.game_locks: Dict[str, asyncio.Lock] = {}
@@ -57,6 +85,9 @@ class GameManager:
         """初始化管理器"""
         try:
             await self._restore_games_from_storage()
+            # 在渲染线程中预加载扑克牌素材，首局渲染无需再读盘解码
+            await self._run_in_render_pool(self.renderer.preload_atlas)
+            self._cleanup_task = create_eager_task(self._periodic_cleanup())
             logger.info("游戏管理器启动完成")
         except Exception as e:
             logger.error(f"游戏管理器初始化失败: {e}")
@@ -65,8 +96,15 @@ class GameManager:
     async def terminate(self):
         """终止管理器"""
         try:
+            if self._cleanup_task:
+                self._cleanup_task.cancel()
+                await asyncio.gather(self._cleanup_task, return_exceptions=True)
+            
+            # 先停止所有超时任务，保证保存的是最终状态，之后不会再有超时弃牌修改游戏
+            await self._cancel_timeout_tasks()
             await self._save_all_games()
             await self._cleanup_all_resources()
+            await asyncio.to_thread(self._render_pool.shutdown)
             logger.info("游戏管理器已安全关闭")
         except Exception as e:
             logger.error(f"游戏管理器关闭失败: {e}")
@@ -85,11 +123,12 @@ class GameManager:
             if group_id in self.active_games:
                 return False, "该群已有正在进行的游戏", None
             
-            # 获取配置参数
-            small_blind = small_blind or self.storage.get_plugin_config_value('small_blind', 1)
-            big_blind = big_blind or self.storage.get_plugin_config_value('big_blind', 2)
-            default_buyin = self.storage.get_plugin_config_value('default_buyin', 50)
-            timeout_seconds = self.storage.get_plugin_config_value('action_timeout', 30)
+            # 获取配置参数（读取缓存的配置快照）
+            cfg = self.storage.get_plugin_config()
+            small_blind = small_blind or cfg.small_blind
+            big_blind = big_blind or cfg.big_blind
+            default_buyin = cfg.default_buyin
+            timeout_seconds = cfg.action_timeout
             
             # 验证参数
             if small_blind <= 0 or big_blind <= 0 or big_blind <= small_blind:
@@ -122,7 +161,6 @@ class GameManager:
             
             game.add_player(creator)
             self.active_games[group_id] = game
-            self.temp_files[group_id] = []
             
             # 保存到存储
             self.storage.save_game(group_id, game.to_dict())
@@ -148,12 +186,13 @@ class GameManager:
                 return False, "您已在游戏中"
             
             # 检查人数限制
-            max_players = self.storage.get_plugin_config_value('max_players', 9)
+            cfg = self.storage.get_plugin_config()
+            max_players = cfg.max_players
             if len(game.players) >= max_players:
                 return False, f"游戏人数已满({max_players}人)"
             
             # 处理买入
-            buyin = buyin or self.storage.get_plugin_config_value('default_buyin', 50)
+            buyin = buyin or cfg.default_buyin
             
             buyin_success, buyin_message = self.player_service.can_buyin(user_id, buyin)
             if not buyin_success:
@@ -191,7 +230,7 @@ class GameManager:
             if not game.get_player(user_id):
                 return False, "您不在游戏中，无法开始游戏"
             
-            min_players = self.storage.get_plugin_config_value('min_players', 2)
+            min_players = self.storage.get_plugin_config().min_players
             if len(game.players) < min_players:
                 return False, f"至少需要{min_players}名玩家才能开始游戏"
             
@@ -199,10 +238,10 @@ class GameManager:
             if not self.state_machine.start_game(game):
                 return False, "游戏启动失败"
             
-            self.storage.save_game(group_id, game.to_dict())
+            await self._persist_game(game)
             
             # 启动超时检查
-            await self._start_timeout_timer(group_id)
+            self._start_timeout_timer(group_id)
             
             logger.info(f"游戏开始: {game.game_id}")
             return True, f"游戏开始！参与玩家: {len(game.players)}人"
@@ -232,8 +271,11 @@ class GameManager:
                 if not success:
                     return False, message
                 
+                # 当前行动者已行动，结束其超时等待
+                self._stop_timeout_timer(group_id)
+                
                 # 保存状态
-                self.storage.save_game(group_id, game.to_dict())
+                await self._persist_game(game)
                 
                 # 检查下注轮是否结束
                 await self._check_and_advance_game(game)
@@ -244,6 +286,11 @@ class GameManager:
                 logger.error(f"处理玩家行动失败: {e}")
                 return False, "行动处理失败"
     
+    async def _persist_game(self, game: TexasHoldemGame) -> None:
+        """保存游戏状态：在事件循环中生成快照，文件写入放到工作线程"""
+        game_data = game.to_dict()
+        await asyncio.to_thread(self.storage.save_game, game.group_id, game_data)
+    
     def get_game_state(self, group_id: str) -> Optional[TexasHoldemGame]:
         """获取游戏状态"""
         return self.active_games.get(group_id)
@@ -253,13 +300,13 @@ class GameManager:
     async def _check_and_advance_game(self, game: TexasHoldemGame):
         """检查游戏状态并推进"""
         # 检查是否只剩一个玩家
-        active_players = [p for p in game.players if not p.is_folded]
+        active_players = game.get_active_players()
         if len(active_players) <= 1:
             await self._end_game_early(game)
             return
         
-        # 检查下注轮是否结束
-        if self.betting_manager.is_betting_round_complete(game):
+        # 检查下注轮是否结束（复用已过滤的未弃牌玩家）
+        if self.betting_manager.is_betting_round_complete(game, active_players):
             await self._advance_to_next_phase(game)
         else:
             # 移动到下一个玩家
@@ -267,7 +314,7 @@ class GameManager:
             if next_player_idx is not None:
                 game.active_player_index = next_player_idx
                 await self._send_action_prompt(game)
-                await self._start_timeout_timer(game.group_id)
+                self._start_timeout_timer(game.group_id)
     
     async def _advance_to_next_phase(self, game: TexasHoldemGame):
         """推进到下一阶段"""
@@ -296,14 +343,14 @@ class GameManager:
         
         # 执行状态转换
         if self.state_machine.transition_to_phase(game, next_phase):
-            self.storage.save_game(game.group_id, game.to_dict())
+            await self._persist_game(game)
             
             if next_phase == GamePhase.SHOWDOWN:
                 await self._handle_showdown(game)
             else:
                 # 开始新的下注轮
                 await self._send_action_prompt(game)
-                await self._start_timeout_timer(game.group_id)
+                self._start_timeout_timer(game.group_id)
     
     def _deal_remaining_cards(self, game: TexasHoldemGame):
         """发完剩余公共牌（全下情况）"""
@@ -352,24 +399,13 @@ class GameManager:
         try:
             game.phase = GamePhase.FINISHED
             
-            # 处理玩家兑现
-            for player in game.players:
-                if player.chips > 0:
-                    success, message = self.player_service.process_cashout(
-                        player.user_id, player.nickname, player.chips
-                    )
-                    if success:
-                        logger.debug(f"玩家 {player.nickname} 兑现 {player.chips}K")
-                
-                # 更新统计数据
-                self.storage.update_player_stats(
-                    player.user_id,
-                    player.nickname,
-                    games_played=1
-                )
+            # 处理玩家兑现并更新统计数据（整局只读写一次玩家文件）
+            settlements = [(p.user_id, p.nickname, p.chips) for p in game.players]
+            await asyncio.to_thread(self.storage.settle_game_players, settlements)
+            logger.debug(f"游戏 {game.game_id} 已结算 {len(settlements)} 名玩家")
             
             # 保存历史记录
-            self._save_game_history(game)
+            await self._save_game_history(game)
             
             # 清理资源
             await self._cleanup_game_resources(game.group_id)
@@ -381,29 +417,43 @@ class GameManager:
     
     # ==================== 超时处理 ====================
     
-    async def _start_timeout_timer(self, group_id: str):
-        """启动简单的超时定时器"""
-        # 取消现有定时器
-        if group_id in self.timeout_tasks:
-            self.timeout_tasks[group_id].cancel()
+    def _start_timeout_timer(self, group_id: str):
+        """为当前行动者启动超时等待（先结束上一次等待）"""
+        self._stop_timeout_timer(group_id)
         
-        # 启动新定时器
         game = self.active_games.get(group_id)
-        if game and game.phase in [GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER]:
-            self.timeout_tasks[group_id] = asyncio.create_task(
-                self._timeout_handler(group_id, game.timeout_seconds)
+        if game and game.phase in BETTING_PHASES:
+            acted = asyncio.Event()
+            self.action_events[group_id] = acted
+            self.timeout_tasks[group_id] = create_eager_task(
+                self._timeout_handler(group_id, game.timeout_seconds, acted)
             )
     
-    async def _timeout_handler(self, group_id: str, timeout_seconds: int):
-        """超时处理器"""
+    def _stop_timeout_timer(self, group_id: str):
+        """结束群组当前的超时等待：事件置位后计时任务自行返回，无需取消"""
+        acted = self.action_events.pop(group_id, None)
+        if acted:
+            acted.set()
+        self.timeout_tasks.pop(group_id, None)
+    
+    async def _timeout_handler(self, group_id: str, timeout_seconds: int, acted: asyncio.Event):
+        """超时处理器：等待行动事件，超时未置位则自动弃牌"""
         try:
-            await asyncio.sleep(timeout_seconds)
+            try:
+                await asyncio.wait_for(acted.wait(), timeout_seconds)
+                return
+            except asyncio.TimeoutError:
+                pass
             
             # 获取或创建游戏锁
             if group_id not in self.game_locks:
                 self.game_locks[group_id] = asyncio.Lock()
             
             async with self.game_locks[group_id]:
+                # 等待锁期间可能已有行动
+                if acted.is_set():
+                    return
+                
                 game = self.active_games.get(group_id)
                 if not game:
                     return
@@ -422,7 +472,7 @@ class GameManager:
                     game.last_action_time = int(time.time())
                     
                     # 保存状态并继续游戏
-                    self.storage.save_game(group_id, game.to_dict())
+                    await self._persist_game(game)
                     await self._check_and_advance_game(game)
             
         except asyncio.CancelledError:
@@ -446,158 +496,296 @@ class GameManager:
     
     # ==================== 图像生成方法 ====================
     
-    def generate_hand_images(self, group_id: str) -> Dict[str, str]:
-        """生成手牌图片"""
+    async def _run_in_render_pool(self, func: Callable, *args) -> Any:
+        """在渲染线程池中执行同步的渲染函数"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._render_pool, func, *args)
+    
+    async def _track_temp_file(self, group_id: str, img_path: str) -> None:
+        """登记临时图片文件，游戏结束时统一清理；超出上限时删除最早登记的文件"""
+        group_files = self.temp_files[group_id]
+        group_files[img_path] = None
+        if len(group_files) <= TEMP_FILES_PER_GROUP:
+            return
+        
+        evicted = set()
+        while len(group_files) > TEMP_FILES_PER_GROUP:
+            evicted_path = next(iter(group_files))
+            del group_files[evicted_path]
+            evicted.add(evicted_path)
+        self._forget_rendered_images(group_id, evicted)
+        await asyncio.to_thread(self._remove_temp_files, evicted)
+    
+    def _forget_rendered_images(self, group_id: str, paths: Set[str]) -> None:
+        """移除指向指定文件的渲染缓存条目"""
+        cache = self.rendered_images.get(group_id)
+        if cache:
+            for kind in [kind for kind, (_, path) in cache.items() if path in paths]:
+                del cache[kind]
+    
+    async def _render_cached(self, group_id: str, kind: str, key: tuple,
+                             render_func: Callable, *args) -> Optional[str]:
+        """按内容键复用已渲染的图片，内容变化时才重新渲染"""
+        cached = self.rendered_images.get(group_id, {}).get(kind)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        img_path = await self._run_in_render_pool(render_func, *args)
+        if img_path:
+            self.rendered_images[group_id][kind] = (key, img_path)
+            await self._track_temp_file(group_id, img_path)
+        return img_path
+    
+    async def generate_hand_images(self, group_id: str) -> Dict[str, str]:
+        """生成手牌图片（各玩家的渲染和编码在线程池中并发执行）"""
         game = self.active_games.get(group_id)
         if not game:
             return {}
         
+        players = [p for p in game.players if len(p.hole_cards) >= 2]
+        results = await asyncio.gather(
+            *(self._run_in_render_pool(self._render_hand_image, player, game) for player in players)
+        )
+        
         hand_images = {}
-        for player in game.players:
-            if len(player.hole_cards) >= 2:
-                try:
-                    hand_img = self.renderer.render_hand_cards(player, game)
-                    filename = f"hand_{player.user_id}_{game.game_id}.png"
-                    img_path = self.renderer.save_image(hand_img, filename)
-                    if img_path:
-                        hand_images[player.user_id] = img_path
-                        self.temp_files[group_id].append(img_path)
-                except Exception as e:
-                    logger.error(f"生成玩家 {player.nickname} 手牌图片失败: {e}")
+        for player, img_path in zip(players, results):
+            if img_path:
+                hand_images[player.user_id] = img_path
+                await self._track_temp_file(group_id, img_path)
         
         return hand_images
     
-    def generate_community_image(self, group_id: str) -> Optional[str]:
-        """生成公共牌图片"""
+    def _render_hand_image(self, player: Player, game: TexasHoldemGame) -> Optional[str]:
+        """渲染并保存单个玩家的手牌图片"""
+        try:
+            hand_img = self.renderer.render_hand_cards(player, game)
+            filename = f"hand_{player.user_id}_{game.game_id}.png"
+            return self.renderer.save_image(hand_img, filename)
+        except Exception as e:
+            logger.error(f"生成玩家 {player.nickname} 手牌图片失败: {e}")
+            return None
+    
+    async def generate_community_image(self, group_id: str) -> Optional[str]:
+        """生成公共牌图片（在渲染线程池中执行）"""
         game = self.active_games.get(group_id)
         if not game:
             return None
         
+        phase = game.phase.value
+        filename = f"community_{game.game_id}_{phase}.png"
+        key = (game.game_id, phase, game.pot, tuple(map(str, game.community_cards)))
+        return await self._render_cached(group_id, "community", key, self._render_community_image, game, filename)
+    
+    def _render_community_image(self, game: TexasHoldemGame, filename: str) -> Optional[str]:
+        """渲染并保存公共牌图片"""
         try:
             community_img = self.renderer.render_community_cards(game)
-            filename = f"community_{game.game_id}_{game.phase.value}.png"
-            img_path = self.renderer.save_image(community_img, filename)
-            if img_path:
-                self.temp_files[group_id].append(img_path)
-                return img_path
+            return self.renderer.save_image(community_img, filename)
         except Exception as e:
             logger.error(f"生成公共牌图片失败: {e}")
-        
-        return None
+            return None
     
-    def generate_showdown_image(self, group_id: str) -> Optional[str]:
-        """生成摊牌结果图片"""
+    async def generate_showdown_image(self, group_id: str) -> Optional[str]:
+        """生成摊牌结果图片（在渲染线程池中执行）"""
         game = self.active_games.get(group_id)
         if not game or not hasattr(game, 'showdown_results'):
             return None
         
+        winners = game.showdown_results.get('winners', [])
+        if not winners:
+            return None
+        
+        filename = f"showdown_{game.game_id}.png"
+        key = (game.game_id, game.pot, tuple(id(w) for w in winners))
+        return await self._render_cached(group_id, "showdown", key, self._render_showdown_image, game, winners, filename)
+    
+    def _render_showdown_image(self, game: TexasHoldemGame, winners: List[Player], filename: str) -> Optional[str]:
+        """渲染并保存摊牌结果图片"""
         try:
-            winners = game.showdown_results.get('winners', [])
-            if winners:
-                showdown_img = self.renderer.render_showdown(game, winners)
-                filename = f"showdown_{game.game_id}.png"
-                img_path = self.renderer.save_image(showdown_img, filename)
-                if img_path:
-                    self.temp_files[group_id].append(img_path)
-                    return img_path
+            showdown_img = self.renderer.render_showdown(game, winners)
+            return self.renderer.save_image(showdown_img, filename)
         except Exception as e:
             logger.error(f"生成摊牌图片失败: {e}")
-        
-        return None
+            return None
     
     # ==================== 资源管理 ====================
     
     async def _restore_games_from_storage(self):
         """从存储恢复游戏"""
-        all_games = self.storage.get_all_games()
-        for group_id, game_data in all_games.items():
+        # 读取和反序列化整体在线程中完成，并限制总耗时，避免启动时阻塞事件循环
+        try:
+            restored_games, stale_group_ids = await asyncio.wait_for(
+                asyncio.to_thread(self._load_stored_games), timeout=RESTORE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"恢复游戏超时（{RESTORE_TIMEOUT}秒），跳过恢复")
+            return
+        
+        for group_id, game in restored_games.items():
+            self.active_games[group_id] = game
+            
+            # 如果是进行中的游戏，恢复超时检查
+            if game.phase in BETTING_PHASES:
+                self._start_timeout_timer(group_id)
+            
+            logger.info(f"恢复游戏: {game.game_id}")
+        
+        # 已结束或无法恢复的游戏统一删除，避免逐个重写存储文件
+        if stale_group_ids:
+            await asyncio.to_thread(self.storage.delete_games, stale_group_ids)
+    
+    def _load_stored_games(self) -> Tuple[Dict[str, TexasHoldemGame], List[str]]:
+        """读取并反序列化存储中的游戏（在工作线程中执行）
+        
+        Returns:
+            Tuple[可恢复的游戏字典, 已结束或无法恢复的群组ID列表]
+        """
+        restored_games = {}
+        stale_group_ids = []
+        
+        for group_id, game_data in self.storage.get_all_games().items():
             try:
                 game = TexasHoldemGame.from_dict(game_data)
-                
-                # 跳过已结束的游戏
-                if game.phase == GamePhase.FINISHED:
-                    self.storage.delete_game(group_id)
-                    continue
-                
-                self.active_games[group_id] = game
-                self.temp_files[group_id] = []
-                
-                # 如果是进行中的游戏，恢复超时检查
-                if game.phase in [GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER]:
-                    await self._start_timeout_timer(group_id)
-                
-                logger.info(f"恢复游戏: {game.game_id}")
-                
             except Exception as e:
                 logger.warning(f"恢复游戏失败 {group_id}: {e}")
-                self.storage.delete_game(group_id)
+                stale_group_ids.append(group_id)
+                continue
+            
+            # 跳过已结束的游戏
+            if game.phase == GamePhase.FINISHED:
+                stale_group_ids.append(group_id)
+            else:
+                restored_games[group_id] = game
+        
+        return restored_games, stale_group_ids
     
     async def _save_all_games(self):
-        """保存所有游戏状态"""
+        """保存所有游戏状态（先统一序列化，再一次性写入存储）"""
+        payload = {}
         for group_id, game in self.active_games.items():
             try:
-                self.storage.save_game(group_id, game.to_dict())
+                payload[group_id] = game.to_dict()
             except Exception as e:
                 logger.warning(f"保存游戏失败 {group_id}: {e}")
+        
+        try:
+            await asyncio.to_thread(self.storage.save_games, payload)
+        except Exception as e:
+            logger.warning(f"批量保存游戏失败: {e}")
     
     async def _cleanup_all_resources(self):
         """清理所有资源"""
-        # 取消所有超时任务
-        for task in self.timeout_tasks.values():
-            task.cancel()
-        
-        # 等待任务完成
-        if self.timeout_tasks:
-            await asyncio.gather(*self.timeout_tasks.values(), return_exceptions=True)
+        await self._cancel_timeout_tasks()
         
         # 清理临时文件
-        for group_id in list(self.temp_files.keys()):
-            await self._cleanup_temp_files(group_id)
+        await asyncio.gather(*(self._cleanup_temp_files(group_id) for group_id in list(self.temp_files)))
         
-        self.timeout_tasks.clear()
         self.temp_files.clear()
+        self.rendered_images.clear()
         self.active_games.clear()
     
+    async def _cancel_timeout_tasks(self):
+        """结束所有超时等待并等待计时任务退出"""
+        tasks = list(self.timeout_tasks.values())
+        for group_id in list(self.action_events):
+            self._stop_timeout_timer(group_id)
+        self.timeout_tasks.clear()
+        # 正在执行超时弃牌的任务不会响应事件，关闭时直接取消
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     async def _cleanup_game_resources(self, group_id: str):
         """清理单个游戏的资源"""
-        # 取消超时任务
-        if group_id in self.timeout_tasks:
-            self.timeout_tasks[group_id].cancel()
-            del self.timeout_tasks[group_id]
+        # 结束超时等待
+        self._stop_timeout_timer(group_id)
         
         # 清理临时文件
         await self._cleanup_temp_files(group_id)
         
+        # 删除存储数据（先于移除实例完成，避免同群新建的游戏数据被误删）
+        await asyncio.to_thread(self.storage.delete_game, group_id)
+        
         # 删除游戏实例
         if group_id in self.active_games:
             del self.active_games[group_id]
-        
-        # 删除存储数据
-        self.storage.delete_game(group_id)
     
     async def _cleanup_temp_files(self, group_id: str):
-        """清理临时文件"""
-        if group_id not in self.temp_files:
-            return
-        
-        import os
-        for file_path in self.temp_files[group_id]:
+        """清理临时文件（整批在线程池中删除，不阻塞事件循环）"""
+        self.rendered_images.pop(group_id, None)
+        file_paths = self.temp_files.pop(group_id, None)
+        if file_paths:
+            await asyncio.to_thread(self._remove_temp_files, file_paths)
+    
+    async def _periodic_cleanup(self):
+        """定期清理过期的临时图片"""
+        while True:
+            await asyncio.sleep(TEMP_CLEANUP_INTERVAL)
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+                await self._cleanup_stale_temp_files()
             except Exception as e:
-                logger.warning(f"删除临时文件失败 {file_path}: {e}")
+                logger.warning(f"定期清理临时文件失败: {e}")
+    
+    async def _cleanup_stale_temp_files(self):
+        """删除超过保留时间的临时图片，并同步移除对应的渲染缓存"""
+        snapshot = {group_id: list(paths) for group_id, paths in self.temp_files.items() if paths}
+        if not snapshot:
+            return
         
-        self.temp_files[group_id] = []
+        cutoff = time.time() - TEMP_FILE_MAX_AGE
+        stale_by_group = await asyncio.to_thread(self._find_stale_files, snapshot, cutoff)
+        
+        stale_paths = []
+        for group_id, paths in stale_by_group.items():
+            # 等待期间游戏可能已结束并释放了这些文件，只处理仍被登记的路径
+            group_files = self.temp_files.get(group_id)
+            if not group_files:
+                continue
+            paths = {path for path in paths if path in group_files}
+            for path in paths:
+                del group_files[path]
+            self._forget_rendered_images(group_id, paths)
+            stale_paths.extend(paths)
+        
+        if stale_paths:
+            await asyncio.to_thread(self._remove_temp_files, stale_paths)
+            logger.debug("已清理 %d 个过期临时文件", len(stale_paths))
+    
+    @staticmethod
+    def _find_stale_files(paths_by_group: Dict[str, List[str]], cutoff: float) -> Dict[str, Set[str]]:
+        """找出修改时间早于 cutoff 或已不存在的文件（在工作线程中执行）"""
+        stale_by_group = {}
+        for group_id, paths in paths_by_group.items():
+            stale = set()
+            for path in paths:
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        stale.add(path)
+                except OSError:
+                    stale.add(path)
+            if stale:
+                stale_by_group[group_id] = stale
+        return stale_by_group
+    
+    @staticmethod
+    def _remove_temp_files(file_paths) -> None:
+        """删除一批临时文件（直接 unlink，不存在则忽略）"""
+        for file_path in file_paths:
+            try:
+                Path(file_path).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("删除临时文件失败 %s: %s", file_path, e)
     
-    def _save_game_history(self, game: TexasHoldemGame):
+    async def _save_game_history(self, game: TexasHoldemGame):
         """保存游戏历史"""
         try:
             history_data = {
                 'game_id': game.game_id,
                 'group_id': game.group_id,
                 'players': [p.to_dict() for p in game.players],
-                'community_cards': [str(card) for card in game.community_cards],
+                'community_cards': list(map(str, game.community_cards)),
                 'pot': game.pot,
                 'started_at': game.created_at,
                 'ended_at': int(time.time()),
@@ -605,7 +793,7 @@ class GameManager:
                 'big_blind': game.big_blind
             }
             
-            self.storage.save_game_history(game.game_id, history_data)
+            await asyncio.to_thread(self.storage.save_game_history, game.game_id, history_data)
             logger.debug(f"游戏历史已保存: {game.game_id}")
             
         except Exception as e:
@@ -9,6 +9,7 @@ from typing import List, Optional, Callable, Any, Dict, Tuple
 from enum import Enum
 from ..models.game import TexasHoldemGame, Player, GamePhase
 from ..models.card import Deck
+from .hand_evaluator import HandEvaluator
 from astrbot.api import logger
 
 
@@ -171,10 +172,8 @@ class GameStateMachine:
     
     def _handle_showdown_phase(self, game: TexasHoldemGame):
         """处理摊牌阶段"""
-        from .hand_evaluator import HandEvaluator
-        
         # 评估所有未弃牌玩家的手牌
-        active_players = [p for p in game.players if not p.is_folded]
+        active_players = game.get_active_players()
         if not active_players:
             return
         
@@ -187,12 +186,12 @@ class GameStateMachine:
         # 排序找出获胜者
         player_hands.sort(key=lambda x: (x[1].value, x[2]), reverse=True)
         
-        # 使用边池系统分配奖池
-        side_pots = self._create_side_pots(game)
+        # 使用边池系统分配奖池（复用已过滤的未弃牌玩家）
+        side_pots = self._create_side_pots(game, active_players)
         winners_info = self._distribute_side_pots(side_pots, player_hands)
         
-        # 获取所有获胜者
-        all_winners = list(set(winner for _, winner in winners_info))
+        # 获取所有获胜者（Player 不可哈希，按对象身份去重并保持顺序）
+        all_winners = list({id(winner): winner for _, winner in winners_info}.values())
         
         # 保存摊牌结果
         game.showdown_results = {
@@ -203,9 +202,8 @@ class GameStateMachine:
         
         logger.info(f"游戏 {game.game_id} 摊牌完成，获胜者: {[w.nickname for w in all_winners]}")
     
-    def _create_side_pots(self, game: TexasHoldemGame) -> List[Dict[str, Any]]:
+    def _create_side_pots(self, game: TexasHoldemGame, active_players: List[Player]) -> List[Dict[str, Any]]:
         """创建边池系统"""
-        active_players = [p for p in game.players if not p.is_folded]
         
         if len(active_players) <= 1:
             return [{'amount': game.pot, 'eligible_players': active_players}]
@@ -238,32 +236,29 @@ class GameStateMachine:
         return side_pots
     
     def _distribute_side_pots(self, side_pots: List[Dict[str, Any]], player_hands: List) -> List[Tuple[int, Player]]:
-        """分配边池，返回(金额, 获胜者)列表"""
-        from .hand_evaluator import HandEvaluator
+        """分配边池，返回(金额, 获胜者)列表
         
+        player_hands 已按 (牌型等级, 比较值) 降序排列，边池获胜者即排在最前且牌力相同的玩家
+        """
         winners_info = []
         
         for side_pot in side_pots:
-            eligible_players = side_pot['eligible_players']
+            eligible_ids = {id(p) for p in side_pot['eligible_players']}
             pot_amount = side_pot['amount']
             
-            # 找出在这个边池中的最强手牌
-            eligible_hands = [(p, r, v) for p, r, v in player_hands if p in eligible_players]
+            # 找出在这个边池中的最强手牌（保持已排序的顺序）
+            eligible_hands = [(p, r, v) for p, r, v in player_hands if id(p) in eligible_ids]
             
             if not eligible_hands:
                 continue
             
-            # 找出边池获胜者
-            best_rank, best_values = eligible_hands[0][1], eligible_hands[0][2]
-            pot_winners = [eligible_hands[0][0]]
-            
-            for player, rank, values in eligible_hands[1:]:
-                comparison = HandEvaluator.compare_hands((rank, values), (best_rank, best_values))
-                if comparison == 0:  # 平手
-                    pot_winners.append(player)
-                elif comparison > 0:  # 更强的手牌
-                    pot_winners = [player]
-                    best_rank, best_values = rank, values
+            # 找出边池获胜者：与第一名牌力相同的连续前缀
+            _, best_rank, best_values = eligible_hands[0]
+            pot_winners = []
+            for player, rank, values in eligible_hands:
+                if (rank, values) != (best_rank, best_values):
+                    break
+                pot_winners.append(player)
             
             # 分配这个边池
             pot_per_winner = pot_amount // len(pot_winners)
@@ -279,16 +274,8 @@ class GameStateMachine:
     
     def _post_blinds(self, game: TexasHoldemGame):
         """下盲注"""
-        player_count = len(game.players)
-        
-        if player_count == 2:
-            # 两人游戏：庄家是小盲注
-            small_blind_idx = game.dealer_index
-            big_blind_idx = (game.dealer_index + 1) % 2
-        else:
-            # 多人游戏：庄家左边是小盲注
-            small_blind_idx = (game.dealer_index + 1) % player_count
-            big_blind_idx = (game.dealer_index + 2) % player_count
+        # 两人游戏庄家是小盲注，多人游戏庄家左边是小盲注
+        small_blind_idx, big_blind_idx = game.get_blind_indices()
         
         # 小盲注
         sb_player = game.players[small_blind_idx]
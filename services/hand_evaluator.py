@@ -1,6 +1,8 @@
 """德州扑克牌型评估服务"""
 from typing import List, Tuple, Optional
 from collections import Counter
+from functools import lru_cache
+from itertools import combinations
 from enum import Enum
 from ..models.card import Card, Rank, Suit
 
@@ -19,6 +21,90 @@ class HandRank(Enum):
     ROYAL_FLUSH = 10      # 皇家同花顺
 
 
+def _card_sort_key(card_key: Tuple[Suit, Rank]) -> Tuple[int, str]:
+    """缓存键排序规则：先牌值后花色"""
+    suit, rank = card_key
+    return rank.value, suit.value
+
+
+@lru_cache(maxsize=None)
+def _rank_five(values: Tuple[int, ...], is_flush: bool) -> Tuple[HandRank, Tuple[int, ...]]:
+    """
+    评估五张牌的牌型（纯整数运算）
+    
+    输入只有 (牌值组合, 是否同花) 两项，全部取值不超过 7462 种（即五张牌的全部等价牌型），
+    无界缓存即相当于按需填充的牌型查找表，摊牌时多名玩家共享的公共牌组合只计算一次。
+    
+    Args:
+        values: 按降序排列的五个牌值
+        is_flush: 五张牌是否同花
+    """
+    # A-2-3-4-5 顺子中 A 当作 1 处理
+    if values == (14, 5, 4, 3, 2):
+        values = (5, 4, 3, 2, 1)
+        is_straight = True
+    else:
+        is_straight = values[0] - values[4] == 4 and len(set(values)) == 5
+    
+    if is_straight:
+        if is_flush:
+            if values[0] == 14:  # A-K-Q-J-10同花顺
+                return HandRank.ROYAL_FLUSH, values
+            return HandRank.STRAIGHT_FLUSH, values[:1]  # 同花顺只比较最高牌
+        return HandRank.STRAIGHT, values[:1]
+    if is_flush:
+        return HandRank.FLUSH, values
+    
+    # 按 (张数, 牌值) 降序分组：依次即为四条/三条/对子的牌值及降序的踢脚
+    groups = sorted(((values.count(v), v) for v in set(values)), reverse=True)
+    counts = tuple(c for c, _ in groups)
+    group_values = tuple(v for _, v in groups)
+    return _RANK_BY_COUNTS[counts], group_values
+
+
+# 牌值分组张数 -> 牌型（非同花、非顺子时）
+_RANK_BY_COUNTS = {
+    (4, 1): HandRank.FOUR_OF_A_KIND,
+    (3, 2): HandRank.FULL_HOUSE,
+    (3, 1, 1): HandRank.THREE_OF_A_KIND,
+    (2, 2, 1): HandRank.TWO_PAIR,
+    (2, 1, 1, 1): HandRank.ONE_PAIR,
+    (1, 1, 1, 1, 1): HandRank.HIGH_CARD,
+}
+
+
+@lru_cache(maxsize=1 << 15)
+def _evaluate_cached(key: Tuple[Tuple[Suit, Rank], ...]) -> Tuple[HandRank, Tuple[int, ...]]:
+    """按规范化牌组缓存的牌型评估（进程内共享）"""
+    # 键按牌值升序排列，倒序后各五张组合天然保持降序，无需逐个排序
+    values = [rank.value for _, rank in reversed(key)]
+    if len(values) < 5:
+        # 不足5张牌，返回高牌
+        return HandRank.HIGH_CARD, tuple(values)
+    
+    suits = [suit for suit, _ in reversed(key)]
+    suit_counts = Counter(suits)
+    flush_suit = next((suit for suit, count in suit_counts.items() if count >= 5), None)
+    
+    # 找出最佳五张牌组合（按 (等级, 比较值) 元组比较）
+    best_key = (0, ())
+    best_rank = HandRank.HIGH_CARD
+    
+    for indices in combinations(range(len(values)), 5):
+        # 没有任何花色够五张时不可能成同花，跳过逐组合的花色检查
+        is_flush = flush_suit is not None and all(suits[i] is flush_suit for i in indices)
+        rank, hand_values = _rank_five(tuple(values[i] for i in indices), is_flush)
+        hand_key = (rank.value, hand_values)
+        if hand_key > best_key:
+            best_key = hand_key
+            best_rank = rank
+            # 皇家同花顺不可能被超越，提前结束枚举
+            if rank is HandRank.ROYAL_FLUSH:
+                break
+    
+    return best_rank, best_key[1]
+
+
 class HandEvaluator:
     """牌型评估器"""
     
@@ -34,102 +120,18 @@ class HandEvaluator:
         Returns:
             Tuple[HandRank, List[int]]: (牌型等级, 比较值列表)
         """
-        all_cards = hole_cards + community_cards
-        if len(all_cards) < 5:
-            # 不足5张牌，返回高牌
-            sorted_values = sorted([card.value for card in all_cards], reverse=True)
-            return HandRank.HIGH_CARD, sorted_values
-        
-        # 找出最佳五张牌组合
-        best_hand = None
-        best_rank = HandRank.HIGH_CARD
-        best_values = []
-        
-        # 生成所有5张牌的组合
-        from itertools import combinations
-        for five_cards in combinations(all_cards, 5):
-            rank, values = HandEvaluator._evaluate_five_cards(list(five_cards))
-            
-            # 比较牌型
-            if rank.value > best_rank.value or (rank == best_rank and HandEvaluator._compare_values(values, best_values) > 0):
-                best_hand = five_cards
-                best_rank = rank
-                best_values = values
-        
-        return best_rank, best_values
+        # 按 (牌值, 花色) 规范化排序作为缓存键，同一组牌无论顺序都命中缓存
+        key = tuple(sorted(((card.suit, card.rank) for card in hole_cards + community_cards), key=_card_sort_key))
+        hand_rank, values = _evaluate_cached(key)
+        return hand_rank, list(values)
     
     @staticmethod
     def _evaluate_five_cards(cards: List[Card]) -> Tuple[HandRank, List[int]]:
         """评估五张牌的牌型"""
-        # 按牌值排序
-        sorted_cards = sorted(cards, key=lambda c: c.value, reverse=True)
-        values = [c.value for c in sorted_cards]
-        suits = [c.suit for c in sorted_cards]
-        
-        # 统计牌值出现次数
-        value_counts = Counter(values)
-        counts = sorted(value_counts.values(), reverse=True)
-        
-        # 检查是否为同花
-        is_flush = len(set(suits)) == 1
-        
-        # 检查是否为顺子
-        is_straight = HandEvaluator._is_straight(values)
-        
-        # 特殊处理A-2-3-4-5顺子
-        if values == [14, 5, 4, 3, 2]:  # A-5顺子
-            is_straight = True
-            values = [5, 4, 3, 2, 1]  # A当作1处理
-        
-        # 判断牌型
-        if is_straight and is_flush:
-            if values == [14, 13, 12, 11, 10]:  # A-K-Q-J-10同花顺
-                return HandRank.ROYAL_FLUSH, values
-            else:
-                return HandRank.STRAIGHT_FLUSH, [values[0]]  # 同花顺只比较最高牌
-        elif counts == [4, 1]:  # 四条
-            four_kind = [v for v, c in value_counts.items() if c == 4][0]
-            kicker = [v for v, c in value_counts.items() if c == 1][0]
-            return HandRank.FOUR_OF_A_KIND, [four_kind, kicker]
-        elif counts == [3, 2]:  # 葫芦
-            three_kind = [v for v, c in value_counts.items() if c == 3][0]
-            pair = [v for v, c in value_counts.items() if c == 2][0]
-            return HandRank.FULL_HOUSE, [three_kind, pair]
-        elif is_flush:  # 同花
-            return HandRank.FLUSH, values
-        elif is_straight:  # 顺子
-            return HandRank.STRAIGHT, [values[0]]
-        elif counts == [3, 1, 1]:  # 三条
-            three_kind = [v for v, c in value_counts.items() if c == 3][0]
-            kickers = sorted([v for v, c in value_counts.items() if c == 1], reverse=True)
-            return HandRank.THREE_OF_A_KIND, [three_kind] + kickers
-        elif counts == [2, 2, 1]:  # 两对
-            pairs = sorted([v for v, c in value_counts.items() if c == 2], reverse=True)
-            kicker = [v for v, c in value_counts.items() if c == 1][0]
-            return HandRank.TWO_PAIR, pairs + [kicker]
-        elif counts == [2, 1, 1, 1]:  # 一对
-            pair = [v for v, c in value_counts.items() if c == 2][0]
-            kickers = sorted([v for v, c in value_counts.items() if c == 1], reverse=True)
-            return HandRank.ONE_PAIR, [pair] + kickers
-        else:  # 高牌
-            return HandRank.HIGH_CARD, values
-    
-    @staticmethod
-    def _is_straight(values: List[int]) -> bool:
-        """检查是否为顺子"""
-        if len(values) != 5:
-            return False
-        
-        unique_values = sorted(set(values), reverse=True)
-        if len(unique_values) != 5:
-            return False
-        
-        # 检查连续性
-        for i in range(4):
-            if unique_values[i] - unique_values[i + 1] != 1:
-                return False
-        
-        return True
+        values = tuple(sorted((c.value for c in cards), reverse=True))
+        is_flush = len({c.suit for c in cards}) == 1
+        rank, hand_values = _rank_five(values, is_flush)
+        return rank, list(hand_values)
     
     @staticmethod
     def _compare_values(values1: List[int], values2: List[int]) -> int:
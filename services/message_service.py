@@ -4,11 +4,28 @@
 """
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Set, Tuple
 from astrbot.api.star import Context
 from astrbot.api import logger
 
 
+@lru_cache(maxsize=1024)
+def _parse_isolated_id(isolated_id: str) -> Tuple[Optional[str], str]:
+    """
+    解析隔离ID（格式: platform:sender_id:session_id）
+    
+    同一玩家每手牌都会多次解析，结果按ID缓存
+    
+    Returns:
+        Tuple[平台名(小写，无法识别时为None), 真实ID]
+    """
+    parts = isolated_id.split(':')
+    if len(parts) >= 3:
+        return parts[0].lower(), parts[1]
+    return None, isolated_id
+
+
 class MessageServiceInterface(ABC):
     """消息服务接口"""
     
@@ -39,9 +56,17 @@ class UniversalMessageService(MessageServiceInterface):
     自动检测平台并选择合适的发送方式
     """
     
+    # 批量私聊发送的最大并发数，避免瞬间压垮 OneBot/CQHTTP 等适配器
+    PRIVATE_SEND_CONCURRENCY = 8
+    # 单条私聊发送的超时时间（秒），避免个别玩家拖慢整批发送
+    PRIVATE_SEND_TIMEOUT = 10.0
+    
     def __init__(self, context: Context):
         self.context = context
         self.platform_adapters: Dict[str, Any] = {}
+        self._private_send_semaphore = asyncio.Semaphore(self.PRIVATE_SEND_CONCURRENCY)
+        # 已重新扫描过但仍未找到的平台，避免每次发送都遍历 get_insts()
+        self._missing_platforms: Set[str] = set()
         self._init_platform_adapters()
     
     def _init_platform_adapters(self):
@@ -144,15 +169,30 @@ class UniversalMessageService(MessageServiceInterface):
             logger.error(f"发送群聊图片失败: {e}")
             return False
     
+    def clear_adapter_cache(self) -> None:
+        """清空平台适配器缓存（插件停止时调用，下次发送时重新扫描）"""
+        self.platform_adapters.clear()
+        self._missing_platforms.clear()
+    
+    def _get_adapter(self, platform: str) -> Optional[Any]:
+        """获取平台适配器
+        
+        优先使用缓存；插件初始化时平台可能尚未加载，未命中时重新扫描一次，
+        之后仍找不到的平台记入未命中集合，不再重复扫描
+        """
+        adapter = self.platform_adapters.get(platform)
+        if adapter is None and platform not in self._missing_platforms:
+            self._init_platform_adapters()
+            adapter = self.platform_adapters.get(platform)
+            if adapter is None:
+                self._missing_platforms.add(platform)
+        return adapter
+    
     def _detect_platform_from_user_id(self, user_id: str) -> Optional[str]:
         """从用户ID检测平台类型"""
         try:
             # 基于用户隔离ID格式: platform:sender_id:session_id
-            if ':' in user_id:
-                parts = user_id.split(':')
-                if len(parts) >= 3:
-                    return parts[0].lower()
-            return None
+            return _parse_isolated_id(user_id)[0]
         except Exception:
             return None
     
@@ -163,7 +203,7 @@ class UniversalMessageService(MessageServiceInterface):
     
     async def _send_private_text_to_platform(self, platform: str, user_id: str, text: str) -> bool:
         """向指定平台发送私聊文本"""
-        adapter = self.platform_adapters.get(platform)
+        adapter = self._get_adapter(platform)
         if not adapter:
             return False
         
@@ -198,7 +238,7 @@ class UniversalMessageService(MessageServiceInterface):
     
     async def _send_private_image_to_platform(self, platform: str, user_id: str, text: str, image_path: str) -> bool:
         """向指定平台发送私聊图片"""
-        adapter = self.platform_adapters.get(platform)
+        adapter = self._get_adapter(platform)
         if not adapter:
             return False
         
@@ -217,8 +257,8 @@ class UniversalMessageService(MessageServiceInterface):
             elif platform in ["weixin", "wechat"]:
                 # 微信平台
                 await adapter.client.post_text(real_user_id, text)
-                with open(image_path, 'rb') as f:
-                    await adapter.client.post_image(real_user_id, f.read())
+                image_data = await asyncio.to_thread(self._read_image_bytes, image_path)
+                await adapter.client.post_image(real_user_id, image_data)
                 return True
             elif platform == "discord":
                 # Discord平台
@@ -241,7 +281,7 @@ class UniversalMessageService(MessageServiceInterface):
     
     async def _send_group_text_to_platform(self, platform: str, group_id: str, text: str) -> bool:
         """向指定平台发送群聊文本"""
-        adapter = self.platform_adapters.get(platform)
+        adapter = self._get_adapter(platform)
         if not adapter:
             return False
         
@@ -276,7 +316,7 @@ class UniversalMessageService(MessageServiceInterface):
     
     async def _send_group_image_to_platform(self, platform: str, group_id: str, image_path: str) -> bool:
         """向指定平台发送群聊图片"""
-        adapter = self.platform_adapters.get(platform)
+        adapter = self._get_adapter(platform)
         if not adapter:
             return False
         
@@ -291,8 +331,8 @@ class UniversalMessageService(MessageServiceInterface):
                 return True
             elif platform in ["weixin", "wechat"]:
                 # 微信平台
-                with open(image_path, 'rb') as f:
-                    await adapter.client.post_image(real_group_id, f.read())
+                image_data = await asyncio.to_thread(self._read_image_bytes, image_path)
+                await adapter.client.post_image(real_group_id, image_data)
                 return True
             elif platform == "discord":
                 # Discord平台
@@ -314,14 +354,16 @@ class UniversalMessageService(MessageServiceInterface):
             
         return False
     
+    @staticmethod
+    def _read_image_bytes(image_path: str) -> bytes:
+        """读取图片文件内容（在线程池中调用）"""
+        with open(image_path, 'rb') as f:
+            return f.read()
+    
     def _extract_real_user_id(self, isolated_user_id: str) -> str:
         """从隔离用户ID中提取真实用户ID"""
         try:
-            if ':' in isolated_user_id:
-                parts = isolated_user_id.split(':')
-                if len(parts) >= 3:
-                    return parts[1]  # sender_id部分
-            return isolated_user_id
+            return _parse_isolated_id(isolated_user_id)[1]  # sender_id部分
         except Exception:
             return isolated_user_id
     
@@ -334,48 +376,51 @@ class UniversalMessageService(MessageServiceInterface):
         """批量发送手牌图片给玩家
         
         Args:
-            players: 玩家列表，包含user_id和nickname
+            players: 玩家列表，包含user_id、nickname和hand_text（手牌文字，无图片时使用）
             hand_images: 手牌图片路径字典，key为user_id
             
         Returns:
             发送结果字典，key为user_id，value为是否成功
         """
-        results = {}
+        # 每位玩家一个发送协程，有界并发执行，单个失败或超时不影响其他玩家
+        recipients = [p for p in players if p['user_id'] in hand_images or p.get('hand_text')]
+        outcomes = await asyncio.gather(
+            *(self._send_hand_card_with_result(
+                p['user_id'], p['nickname'], f"🃏 {p['nickname']}，您的手牌：", hand_images.get(p['user_id']),
+                p.get('hand_text', '')
+            ) for p in recipients),
+            return_exceptions=True
+        )
         
-        # 并行发送所有手牌
-        tasks = []
-        for player in players:
+        results = {}
+        for player, outcome in zip(recipients, outcomes):
             user_id = player['user_id']
-            nickname = player['nickname']
-            
-            if user_id in hand_images:
-                text = f"🃏 {nickname}，您的手牌："
-                image_path = hand_images[user_id]
-                
-                task = asyncio.create_task(
-                    self._send_hand_card_with_result(user_id, nickname, text, image_path)
-                )
-                tasks.append((user_id, task))
-        
-        # 等待所有任务完成
-        for user_id, task in tasks:
-            try:
-                results[user_id] = await task
-            except Exception as e:
-                logger.error(f"发送手牌给 {user_id} 失败: {e}")
+            if isinstance(outcome, BaseException):
+                logger.error(f"发送手牌给 {user_id} 失败: {outcome}")
                 results[user_id] = False
+            else:
+                results[user_id] = outcome
         
         return results
     
-    async def _send_hand_card_with_result(self, user_id: str, nickname: str, text: str, image_path: str) -> bool:
-        """发送手牌并返回结果"""
+    async def _send_hand_card_with_result(self, user_id: str, nickname: str, text: str,
+                                          image_path: Optional[str], hand_text: str = "") -> bool:
+        """发送手牌并返回结果（有图片发图片，否则发手牌文字）"""
         try:
-            success = await self.send_private_image(user_id, text, image_path)
+            async with self._private_send_semaphore:
+                if image_path:
+                    send = self.send_private_image(user_id, text, image_path)
+                else:
+                    send = self.send_private_text(user_id, f"{text}{hand_text}")
+                success = await asyncio.wait_for(send, timeout=self.PRIVATE_SEND_TIMEOUT)
             if success:
                 logger.info(f"手牌已发送给 {nickname}")
             else:
                 logger.warning(f"手牌发送失败: {nickname}")
             return success
+        except asyncio.TimeoutError:
+            logger.warning(f"手牌发送超时: {nickname}")
+            return False
         except Exception as e:
             logger.error(f"发送手牌异常 {nickname}: {e}")
             return False
@@ -7,15 +7,30 @@
 - 游戏结算界面生成
 - 临时文件管理和清理
 """
+import fnmatch
+import glob
+import io
 import os
+import re
 import tempfile
-from typing import List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
 from PIL import Image, ImageDraw, ImageFont
 from ..models.card import Card, Suit, Rank
 from ..models.game import TexasHoldemGame, Player
 from .hand_evaluator import HandEvaluator, HandRank
 from astrbot.api import logger
 
+# Pillow-SIMD 停留在 Pillow 9.x，较早版本没有 Resampling 枚举
+RESAMPLE_LANCZOS = getattr(Image, 'Resampling', Image).LANCZOS
+
+# 临时图片的 PNG 压缩级别：图片只在本局内使用，优先编码速度而非体积
+PNG_COMPRESS_LEVEL = 1
+
+# 牌面条带缓存的最大条目数
+CARD_STRIP_CACHE_SIZE = 256
+
 
 class PokerRenderer:
     """
@@ -33,6 +48,17 @@ class PokerRenderer:
         self.card_width = 120
         self.card_height = 168
         self.font_cache = {}
+        self._fallback_blank: Optional[Image.Image] = None
+        
+        # 牌面精灵缓存：(花色, 点数) 或 "back" 与目标尺寸 -> 已解码并缩放的图像（只读共享）
+        self._card_cache: Dict[tuple, Image.Image] = {}
+        
+        # 按牌面组合缓存已拼好的牌面条带（渲染在线程池中执行，需加锁）
+        self._card_strip_cache: OrderedDict = OrderedDict()
+        self._card_strip_lock = threading.Lock()
+        
+        # 扑克牌素材格式：优先使用WebP无损素材，不存在时回退到PNG
+        self.card_ext = self._detect_card_asset_ext()
         
         # 临时文件管理
         self.temp_dir = None
@@ -54,6 +80,12 @@ class PokerRenderer:
             logger.warning(f"初始化临时目录失败: {e}")
             self.temp_dir = tempfile.gettempdir()
     
+    def _detect_card_asset_ext(self) -> str:
+        """检测扑克牌素材的文件格式"""
+        if os.path.exists(os.path.join(self.assets_dir, "cards", "back.webp")):
+            return "webp"
+        return "png"
+    
     def _get_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         """获取字体（带缓存）"""
         font_key = f"{size}_{bold}"
@@ -69,24 +101,61 @@ class PokerRenderer:
                 self.font_cache[font_key] = ImageFont.load_default()
         return self.font_cache[font_key]
     
-    def _create_card_image(self, card: Card, face_up: bool = True) -> Image.Image:
-        """创建单张扑克牌图像 - 使用预制素材"""
+    def preload_atlas(self) -> int:
+        """
+        预加载全部 52 张牌面和牌背，之后的渲染只做粘贴，不再读盘解码和缩放
+        
+        Returns:
+            已缓存的牌面数量
+        """
+        for suit in Suit:
+            for rank in Rank:
+                self._create_card_image(Card(suit, rank))
+        self._create_card_image(Card(Suit.SPADES, Rank.ACE), face_up=False)
+        logger.debug(f"扑克牌素材预加载完成: {len(self._card_cache)} 张")
+        return len(self._card_cache)
+    
+    def _create_card_image(self, card: Card, face_up: bool = True,
+                           size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        获取单张扑克牌图像（带缓存）
+        
+        返回的图像在多次渲染间共享，调用方只能读取或粘贴，不得修改。
+        
+        Args:
+            card: 扑克牌
+            face_up: 是否正面朝上
+            size: 目标尺寸，缺省为标准牌面尺寸
+        """
+        size = size or (self.card_width, self.card_height)
+        key = ((card.suit, card.rank) if face_up else "back", size)
+        card_img = self._card_cache.get(key)
+        if card_img is None:
+            if size == (self.card_width, self.card_height):
+                card_img = self._load_card_image(card, face_up)
+            else:
+                card_img = self._create_card_image(card, face_up).resize(size, RESAMPLE_LANCZOS)
+            self._card_cache[key] = card_img
+        return card_img
+    
+    def _load_card_image(self, card: Card, face_up: bool = True) -> Image.Image:
+        """加载单张扑克牌图像 - 使用预制素材"""
         try:
             if not face_up:
                 # 加载牌背图片
-                card_path = os.path.join(self.assets_dir, "cards", "back.png")
+                card_path = os.path.join(self.assets_dir, "cards", f"back.{self.card_ext}")
             else:
                 # 根据牌面和花色加载对应图片
                 rank_str = self._get_rank_filename(card.rank)
                 suit_str = self._get_suit_filename(card.suit)
-                filename = f"{rank_str}_{suit_str}.png"
+                filename = f"{rank_str}_{suit_str}.{self.card_ext}"
                 card_path = os.path.join(self.assets_dir, "cards", filename)
             
             if os.path.exists(card_path):
-                # 加载并调整图片尺寸
+                # 加载并调整图片尺寸（convert 会完成解码）
                 card_img = Image.open(card_path).convert('RGBA')
                 if card_img.size != (self.card_width, self.card_height):
-                    card_img = card_img.resize((self.card_width, self.card_height), Image.Resampling.LANCZOS)
+                    card_img = card_img.resize((self.card_width, self.card_height), RESAMPLE_LANCZOS)
                 return card_img
             else:
                 logger.warning(f"扑克牌素材文件不存在: {card_path}")
@@ -100,31 +169,10 @@ class PokerRenderer:
     
     def _draw_rounded_rectangle(self, draw: ImageDraw.Draw, bbox: List[Tuple[int, int]], 
                               radius: int, fill=None, outline=None, width=1):
-        """绘制圆角矩形"""
+        """绘制圆角矩形（使用Pillow原生实现）"""
         x1, y1 = bbox[0]
         x2, y2 = bbox[1]
-        
-        # 绘制主体矩形
-        draw.rectangle([x1 + radius, y1, x2 - radius, y2], fill=fill)
-        draw.rectangle([x1, y1 + radius, x2, y2 - radius], fill=fill)
-        
-        # 绘制四个角的圆形
-        draw.ellipse([x1, y1, x1 + 2*radius, y1 + 2*radius], fill=fill)
-        draw.ellipse([x2 - 2*radius, y1, x2, y1 + 2*radius], fill=fill)
-        draw.ellipse([x1, y2 - 2*radius, x1 + 2*radius, y2], fill=fill)
-        draw.ellipse([x2 - 2*radius, y2 - 2*radius, x2, y2], fill=fill)
-        
-        if outline:
-            # 绘制边框
-            draw.arc([x1, y1, x1 + 2*radius, y1 + 2*radius], 180, 270, fill=outline, width=width)
-            draw.arc([x2 - 2*radius, y1, x2, y1 + 2*radius], 270, 360, fill=outline, width=width)
-            draw.arc([x1, y2 - 2*radius, x1 + 2*radius, y2], 90, 180, fill=outline, width=width)
-            draw.arc([x2 - 2*radius, y2 - 2*radius, x2, y2], 0, 90, fill=outline, width=width)
-            
-            draw.line([x1 + radius, y1, x2 - radius, y1], fill=outline, width=width)
-            draw.line([x1 + radius, y2, x2 - radius, y2], fill=outline, width=width)
-            draw.line([x1, y1 + radius, x1, y2 - radius], fill=outline, width=width)
-            draw.line([x2, y1 + radius, x2, y2 - radius], fill=outline, width=width)
+        draw.rounded_rectangle((x1, y1, x2, y2), radius=radius, fill=fill, outline=outline, width=width)
     
     def _draw_card_back(self, draw: ImageDraw.Draw):
         """绘制牌背图案"""
@@ -221,16 +269,13 @@ class PokerRenderer:
         
         # 绘制手牌
         if len(player.hole_cards) >= 2:
-            card1_img = self._create_card_image(player.hole_cards[0])
-            card2_img = self._create_card_image(player.hole_cards[1])
+            strip = self._get_card_strip(player.hole_cards[:2], 2, 20)
             
             # 计算卡片位置
-            total_width = 2 * self.card_width + 20  # 两张牌加间距
-            start_x = (canvas_width - total_width) // 2
+            start_x = (canvas_width - strip.width) // 2
             start_y = 120
             
-            canvas.paste(card1_img, (start_x, start_y), card1_img)
-            canvas.paste(card2_img, (start_x + self.card_width + 20, start_y), card2_img)
+            canvas.paste(strip, (start_x, start_y), strip)
         
         # 绘制玩家信息
         self._draw_player_info(canvas, player, 50, 300)
@@ -248,25 +293,51 @@ class PokerRenderer:
         title = f"游戏 {game.game_id} - {game.phase.value.upper()}"
         self._draw_title_area(canvas, title, f"底池: {game.pot}")
         
-        # 绘制5张公共牌位置
-        card_spacing = 20
-        total_width = 5 * self.card_width + 4 * card_spacing
-        start_x = (canvas_width - total_width) // 2
+        # 绘制5张公共牌位置（未翻开的位置为牌背）
+        strip = self._get_card_strip(game.community_cards, 5, 20)
+        start_x = (canvas_width - strip.width) // 2
         start_y = 120
         
-        for i in range(5):
-            x = start_x + i * (self.card_width + card_spacing)
+        canvas.paste(strip, (start_x, start_y), strip)
+        
+        return canvas
+    
+    def _get_card_strip(self, cards: Sequence[Card], slots: int, spacing: int) -> Image.Image:
+        """
+        获取一排扑克牌的拼接条带（带 LRU 缓存）
+        
+        条带只包含牌面，不含游戏编号、昵称等随局变化的内容，
+        相同的牌面组合在不同游戏、不同群之间可直接复用。
+        
+        Args:
+            cards: 按显示顺序排列的牌，不足 slots 张的位置绘制牌背
+            slots: 牌位数量
+            spacing: 牌间距
             
-            if i < len(game.community_cards):
-                # 已翻开的牌
-                card_img = self._create_card_image(game.community_cards[i])
+        Returns:
+            透明背景的条带图像（只读，调用方不得修改）
+        """
+        key = (slots, spacing, tuple((card.suit, card.rank) for card in cards[:slots]))
+        with self._card_strip_lock:
+            strip = self._card_strip_cache.get(key)
+            if strip is not None:
+                self._card_strip_cache.move_to_end(key)
+                return strip
+        
+        strip = Image.new('RGBA', (slots * self.card_width + (slots - 1) * spacing, self.card_height), (0, 0, 0, 0))
+        for i in range(slots):
+            if i < len(cards):
+                card_img = self._create_card_image(cards[i])
             else:
-                # 未翻开的牌（牌背）
                 card_img = self._create_card_image(Card(Suit.SPADES, Rank.ACE), face_up=False)
-            
-            canvas.paste(card_img, (x, start_y), card_img)
-        
-        return canvas
+            # 牌之间不重叠，直接复制 RGBA，贴到画布时再统一按透明度合成
+            strip.paste(card_img, (i * (self.card_width + spacing), 0))
+        
+        with self._card_strip_lock:
+            self._card_strip_cache[key] = strip
+            if len(self._card_strip_cache) > CARD_STRIP_CACHE_SIZE:
+                self._card_strip_cache.popitem(last=False)
+        return strip
     
     def render_showdown(self, game: TexasHoldemGame, winners: List[Player]) -> Image.Image:
         """渲染摊牌结果"""
@@ -285,9 +356,21 @@ class PokerRenderer:
         active_players = [p for p in game.players if not p.is_folded]
         y_offset = 200
         
-        for i, player in enumerate(active_players):
-            is_winner = player in winners
-            self._draw_player_showdown(canvas, player, game.community_cards, 50, y_offset, is_winner)
+        # Player 是按字段比较的 dataclass，按对象身份集合判断获胜者
+        winner_ids = {id(w) for w in winners}
+        
+        # 复用摊牌阶段已评估的牌型，按对象身份直接查找，避免逐个玩家重新评估
+        showdown_results = getattr(game, 'showdown_results', None) or {}
+        evaluated_hands = {
+            id(player): (hand_rank, values)
+            for player, hand_rank, values in showdown_results.get('player_hands', ())
+            if hand_rank is not None
+        }
+        
+        for player in active_players:
+            is_winner = id(player) in winner_ids
+            self._draw_player_showdown(canvas, player, game.community_cards, 50, y_offset, is_winner,
+                                       evaluated_hands.get(id(player)))
             y_offset += 120
         
         return canvas
@@ -327,15 +410,15 @@ class PokerRenderer:
         spacing = 10
         
         for i, card in enumerate(community_cards):
-            card_img = self._create_card_image(card)
-            card_img = card_img.resize((card_width_small, card_height_small), Image.Resampling.LANCZOS)
+            card_img = self._create_card_image(card, size=(card_width_small, card_height_small))
             
             card_x = x + i * (card_width_small + spacing)
             canvas.paste(card_img, (card_x, y), card_img)
     
     def _draw_player_showdown(self, canvas: Image.Image, player: Player, community_cards: List[Card], 
-                            x: int, y: int, is_winner: bool):
-        """绘制玩家摊牌信息"""
+                            x: int, y: int, is_winner: bool,
+                            evaluated_hand: Optional[Tuple[HandRank, List[int]]] = None):
+        """绘制玩家摊牌信息（evaluated_hand 为已评估的牌型，缺省时现场评估）"""
         draw = ImageDraw.Draw(canvas)
         
         # 背景色
@@ -351,13 +434,12 @@ class PokerRenderer:
         # 绘制手牌（小尺寸）
         card_size = 40
         for i, card in enumerate(player.hole_cards):
-            card_img = self._create_card_image(card)
-            card_img = card_img.resize((card_size, card_size * 168 // 120), Image.Resampling.LANCZOS)
+            card_img = self._create_card_image(card, size=(card_size, card_size * 168 // 120))
             canvas.paste(card_img, (x + 200 + i * (card_size + 5), y + 10), card_img)
         
         # 评估并显示牌型
         if community_cards:
-            hand_rank, values = HandEvaluator.evaluate_hand(player.hole_cards, community_cards)
+            hand_rank, values = evaluated_hand or HandEvaluator.evaluate_hand(player.hole_cards, community_cards)
             hand_desc = HandEvaluator.get_hand_description(hand_rank, values)
             draw.text((x + 200, y + 60), f"牌型: {hand_desc}", font=self._get_font(14), 
                      fill=(255, 255, 255, 255))
@@ -377,17 +459,20 @@ class PokerRenderer:
         Returns:
             保存的文件路径，失败返回None
         """
+        if not self.temp_dir:
+            logger.error("临时目录未初始化")
+            return None
+        
         try:
-            if not self.temp_dir:
-                logger.error("临时目录未初始化")
-                return None
-            
             # 确保文件名安全
             safe_filename = self._sanitize_filename(filename)
             filepath = os.path.join(self.temp_dir, safe_filename)
             
-            # 保存图像
-            image.save(filepath, 'PNG', quality=95, optimize=True)
+            # 先在内存中完成编码，再一次性写入文件，编码失败时不会留下半截文件
+            buffer = io.BytesIO()
+            image.save(buffer, 'PNG', compress_level=PNG_COMPRESS_LEVEL, optimize=False)
+            with open(filepath, 'wb') as f:
+                f.write(buffer.getbuffer())
             
             logger.debug(f"图像已保存: {filepath}")
             return filepath
@@ -406,7 +491,6 @@ class PokerRenderer:
         Returns:
             安全的文件名
         """
-        import re
         # 移除危险字符
         safe_name = re.sub(r'[^\w\-_\.]', '_', filename)
         # 确保.png扩展名
@@ -425,35 +509,34 @@ class PokerRenderer:
             清理的文件数量
         """
         cleaned_count = 0
+        if not self.temp_dir:
+            return 0
+        
+        # 默认清理所有PNG文件
+        pattern = pattern or "*.png"
         
         try:
-            if not self.temp_dir or not os.path.exists(self.temp_dir):
-                return 0
-            
-            import glob
-            
-            if pattern:
-                # 清理匹配模式的文件
-                search_pattern = os.path.join(self.temp_dir, pattern)
-                files_to_clean = glob.glob(search_pattern)
-            else:
-                # 清理所有PNG文件
-                files_to_clean = glob.glob(os.path.join(self.temp_dir, "*.png"))
-            
-            for filepath in files_to_clean:
-                try:
-                    if os.path.isfile(filepath):
-                        os.remove(filepath)
+            # scandir 的目录项自带文件类型，无需逐个 stat；删除时直接 unlink，不存在则忽略
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not fnmatch.fnmatch(entry.name, pattern):
+                        continue
+                    try:
+                        os.unlink(entry.path)
                         cleaned_count += 1
-                        logger.debug(f"已删除临时文件: {filepath}")
-                except Exception as e:
-                    logger.warning(f"删除文件失败 {filepath}: {e}")
+                        logger.debug("已删除临时文件: %s", entry.path)
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        logger.warning("删除文件失败 %s: %s", entry.path, e)
             
             if cleaned_count > 0:
-                logger.info(f"已清理 {cleaned_count} 个临时文件")
+                logger.info("已清理 %d 个临时文件", cleaned_count)
             
+        except FileNotFoundError:
+            return 0
         except Exception as e:
-            logger.error(f"清理临时文件时出错: {e}")
+            logger.error("清理临时文件时出错: %s", e)
         
         return cleaned_count
     
@@ -480,7 +563,6 @@ class PokerRenderer:
             if not self.temp_dir or not os.path.exists(self.temp_dir):
                 return 0
             
-            import glob
             files = glob.glob(os.path.join(self.temp_dir, "*.png"))
             return len(files)
             
@@ -488,20 +570,28 @@ class PokerRenderer:
             logger.warning(f"统计临时文件时出错: {e}")
             return 0
     
+    def _get_fallback_blank(self) -> Image.Image:
+        """获取回退绘制用的空白卡片模板（边框只绘制一次）"""
+        if self._fallback_blank is None:
+            card_img = Image.new('RGBA', (self.card_width, self.card_height), (255, 255, 255, 255))
+            draw = ImageDraw.Draw(card_img)
+            
+            # 绘制卡片边框
+            border_color = (0, 0, 0, 255)
+            corner_radius = 12
+            
+            # 绘制圆角矩形
+            self._draw_rounded_rectangle(draw, [(0, 0), (self.card_width-1, self.card_height-1)], 
+                                       corner_radius, fill=(255, 255, 255, 255), outline=border_color, width=2)
+            self._fallback_blank = card_img
+        return self._fallback_blank
+    
     def _draw_card_fallback(self, card: Card, face_up: bool = True) -> Image.Image:
         """当素材文件不存在时的回退绘制方法"""
-        # 创建卡片背景
-        card_img = Image.new('RGBA', (self.card_width, self.card_height), (255, 255, 255, 255))
+        # 从带边框的空白卡片模板复制
+        card_img = self._get_fallback_blank().copy()
         draw = ImageDraw.Draw(card_img)
         
-        # 绘制卡片边框
-        border_color = (0, 0, 0, 255)
-        corner_radius = 12
-        
-        # 绘制圆角矩形
-        self._draw_rounded_rectangle(draw, [(0, 0), (self.card_width-1, self.card_height-1)], 
-                                   corner_radius, fill=(255, 255, 255, 255), outline=border_color, width=2)
-        
         if not face_up:
             # 绘制牌背
             self._draw_card_back(draw)
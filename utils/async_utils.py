@@ -0,0 +1,26 @@
+"""异步任务工具
+
+提供插件内部后台任务的创建方法
+"""
+import asyncio
+from typing import Any, Coroutine
+
+
+def create_eager_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    创建插件内部的后台任务
+
+    Python 3.12+ 使用 eager 任务：协程在创建时立即同步执行到第一次真正挂起，
+    省去一次事件循环调度；旧版本回退为普通 create_task。
+    只作用于本插件创建的任务，不修改 AstrBot 共享事件循环的任务工厂。
+
+    Args:
+        coro: 要执行的协程
+
+    Returns:
+        对应的任务对象
+    """
+    eager_factory = getattr(asyncio, 'eager_task_factory', None)
+    if eager_factory is None:
+        return asyncio.create_task(coro)
+    return eager_factory(asyncio.get_running_loop(), coro)
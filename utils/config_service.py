@@ -3,12 +3,47 @@
 提供插件配置的统一管理
 """
 import json
+from dataclasses import dataclass, fields
 from typing import Any, Dict, Optional, List, Tuple
 from pathlib import Path
 from astrbot.api.star import StarTools, Context
 from astrbot.api import logger
 
 
+@dataclass(frozen=True)
+class PluginConfig:
+    """
+    插件配置快照（所有筹码金额以K为单位）
+    
+    一次性读取全部配置项，供命令处理等热点路径直接读取属性
+    """
+    default_chips: int = 500        # 玩家初始筹码
+    default_buyin: int = 50         # 默认买入金额
+    small_blind: int = 1            # 默认小盲注
+    big_blind: int = 2              # 默认大盲注
+    min_buyin: int = 10             # 最小买入金额
+    max_buyin: int = 200            # 最大买入金额
+    min_bet: int = 1                # 最小下注金额
+    action_timeout: int = 30        # 玩家行动超时时间(秒)
+    min_players: int = 2            # 最少玩家数
+    max_players: int = 9            # 最多玩家数
+    auto_cleanup_days: int = 30     # 自动清理历史记录天数
+    send_hand_image: bool = True    # 是否以图片形式私发手牌
+    
+    @classmethod
+    def from_storage(cls, storage) -> 'PluginConfig':
+        """
+        从存储管理器加载配置快照
+        
+        Args:
+            storage: 提供 get_plugin_config_value 的存储管理器
+        """
+        return cls(**{
+            f.name: storage.get_plugin_config_value(f.name, f.default)
+            for f in fields(cls)
+        })
+
+
 class ConfigService:
     """配置管理服务"""
     
@@ -3,13 +3,32 @@
 提供错误处理、参数验证等通用装饰器
 """
 import asyncio
+import time
+from contextlib import contextmanager
 from functools import wraps
-from typing import Any, Callable, AsyncGenerator
+from typing import Any, Callable, AsyncGenerator, Iterator
 from .error_handler import GameError, ValidationError
 from astrbot.api.event import AstrMessageEvent, MessageEventResult
 from astrbot.api import logger
 
 
+@contextmanager
+def log_errors(operation_name: str) -> Iterator[None]:
+    """
+    异常记录守卫
+
+    用于后台流程（消息发送、回调等）的边界处：记录异常后吞掉，
+    内部函数无需各自 try/except，同一异常只会被记录一次。
+
+    Args:
+        operation_name: 操作名称，用于日志
+    """
+    try:
+        yield
+    except Exception as e:
+        logger.error(f"{operation_name}失败: {e}")
+
+
 def error_handler(operation_name: str):
     """
     统一错误处理装饰器
@@ -168,7 +187,6 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            import time
             last_exception = None
             
             for attempt in range(max_retries + 1):
@@ -3,6 +3,9 @@
 提供筹码金额的格式化显示功能
 注意：所有金额内部以K为单位存储
 """
+import datetime
+import time
+from functools import lru_cache
 from typing import Union
 
 
@@ -10,10 +13,13 @@ class MoneyFormatter:
     """筹码金额格式化器"""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def format_chips(amount: Union[int, float]) -> str:
         """
         格式化筹码显示
         
+        盲注、买入额等金额会被反复格式化，结果按金额缓存
+        
         Args:
             amount: 筹码数量（以K为单位）
             
@@ -164,12 +170,10 @@ class MoneyFormatter:
         Returns:
             格式化后的盈亏显示，包含图标
         """
-        winnings_text = MoneyFormatter.format_chips(abs(winnings)) if winnings != 0 else "0K"
-        
         if winnings > 0:
-            return f"💚 +{winnings_text}"
+            return f"💚 +{MoneyFormatter.format_chips(winnings)}"
         elif winnings < 0:
-            return f"💸 -{winnings_text}"
+            return f"💸 -{MoneyFormatter.format_chips(-winnings)}"
         else:
             return f"⚪ ±0K"
     
@@ -185,9 +189,6 @@ class MoneyFormatter:
         Returns:
             格式化后的余额信息列表（每行一个字符串）
         """
-        import time
-        import datetime
-        
         # 提取数据
         total_chips = player_info.get('total_chips', 0)
         total_winnings = player_info.get('total_winnings', 0)
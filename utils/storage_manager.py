@@ -3,12 +3,31 @@
 整合所有存储服务，提供统一的数据访问接口
 """
 import json
+import threading
 import time
+from functools import wraps
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from astrbot.api.star import StarTools, Context
 from astrbot.api import logger
 
+from .config_service import PluginConfig
+
+# orjson 为可选依赖：安装后用于加速 JSON 编解码，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _synchronized(method):
+    """文件读-改-写操作加锁，避免线程池中的存储操作与事件循环线程互相覆盖"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._file_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class StorageManager:
     """统一存储管理器"""
@@ -24,6 +43,9 @@ class StorageManager:
         self.plugin_name = plugin_name
         self.context = context
         self.data_dir = StarTools.get_data_dir(plugin_name)
+        self._config_snapshot: Optional[PluginConfig] = None
+        # 存储操作可能在 asyncio.to_thread 的工作线程中执行，读-改-写需串行化
+        self._file_lock = threading.RLock()
         self._ensure_data_structure()
         
         logger.info("统一存储管理器初始化完成")
@@ -54,11 +76,14 @@ class StorageManager:
         """获取文件路径"""
         return self.data_dir / filename
     
+    @_synchronized
     def _load_json(self, filename: str) -> Dict[str, Any]:
         """加载JSON文件"""
         file_path = self._get_file_path(filename)
         try:
             if file_path.exists():
+                if orjson is not None:
+                    return orjson.loads(file_path.read_bytes())
                 with open(file_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             return {}
@@ -66,10 +91,15 @@ class StorageManager:
             logger.error(f"加载文件失败 {filename}: {e}")
             return {}
     
+    @_synchronized
     def _save_json(self, filename: str, data: Dict[str, Any]):
         """保存JSON文件"""
         file_path = self._get_file_path(filename)
         try:
+            if orjson is not None:
+                # 与标准库输出保持一致：缩进两格、非 ASCII 字符原样写出、非字符串键转为字符串
+                file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                return
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception as e:
@@ -108,12 +138,28 @@ class StorageManager:
             logger.warning(f"获取配置值失败 {key}: {e}")
             return default
     
+    def get_plugin_config(self) -> PluginConfig:
+        """
+        获取插件配置快照
+        
+        首次访问时加载全部配置项并缓存，之后直接返回缓存的快照
+        """
+        if self._config_snapshot is None:
+            self._config_snapshot = PluginConfig.from_storage(self)
+        return self._config_snapshot
+    
+    def invalidate_config_cache(self) -> None:
+        """使配置快照失效，下次访问时重新加载"""
+        self._config_snapshot = None
+    
+    @_synchronized
     def set_local_config(self, key: str, value: Any) -> bool:
         """设置本地配置值"""
         try:
             config = self._load_json('config.json')
             config[key] = value
             self._save_json('config.json', config)
+            self.invalidate_config_cache()
             return True
         except Exception as e:
             logger.error(f"设置本地配置失败 {key}: {e}")
@@ -153,12 +199,23 @@ class StorageManager:
         games = self._load_json('games.json')
         return games.get(group_id)
     
+    @_synchronized
     def save_game(self, group_id: str, game_data: Dict[str, Any]) -> None:
         """保存游戏数据"""
         games = self._load_json('games.json')
         games[group_id] = game_data
         self._save_json('games.json', games)
     
+    @_synchronized
+    def save_games(self, games_data: Dict[str, Dict[str, Any]]) -> None:
+        """批量保存游戏数据（只读写一次文件）"""
+        if not games_data:
+            return
+        games = self._load_json('games.json')
+        games.update(games_data)
+        self._save_json('games.json', games)
+    
+    @_synchronized
     def delete_game(self, group_id: str) -> None:
         """删除游戏数据"""
         games = self._load_json('games.json')
@@ -166,10 +223,21 @@ class StorageManager:
             del games[group_id]
             self._save_json('games.json', games)
     
+    @_synchronized
+    def delete_games(self, group_ids: List[str]) -> None:
+        """批量删除游戏数据（只读写一次文件）"""
+        if not group_ids:
+            return
+        games = self._load_json('games.json')
+        removed = [group_id for group_id in group_ids if games.pop(group_id, None) is not None]
+        if removed:
+            self._save_json('games.json', games)
+    
     def get_all_games(self) -> Dict[str, Any]:
         """获取所有游戏数据"""
         return self._load_json('games.json')
     
+    @_synchronized
     def save_game_history(self, game_id: str, history_data: Dict[str, Any]) -> None:
         """保存游戏历史"""
         history = self._load_json('game_history.json')
@@ -203,6 +271,7 @@ class StorageManager:
         players = self._load_json('players.json')
         return players.get(user_id)
     
+    @_synchronized
     def save_player(self, user_id: str, player_data: Dict[str, Any]) -> None:
         """保存玩家数据"""
         players = self._load_json('players.json')
@@ -217,6 +286,7 @@ class StorageManager:
         """保存玩家信息（新的统一接口）"""
         self.save_player(user_id, player_data)
     
+    @_synchronized
     def delete_player_info(self, user_id: str) -> None:
         """删除玩家信息"""
         players = self._load_json('players.json')
@@ -228,6 +298,7 @@ class StorageManager:
         """获取所有玩家数据"""
         return self._load_json('players.json')
     
+    @_synchronized
     def update_player_stats(self, user_id: str, nickname: str, chips_change: int = 0,
                           games_played: int = 0, hands_won: int = 0) -> None:
         """更新玩家统计数据"""
@@ -262,6 +333,42 @@ class StorageManager:
             logger.error(f"更新玩家统计数据失败 {nickname}: {e}")
             raise
     
+    @_synchronized
+    def settle_game_players(self, settlements: List[Tuple[str, str, int]]) -> None:
+        """
+        批量结算本局玩家（兑现筹码并累计对局数，只读写一次文件）
+        
+        Args:
+            settlements: (用户ID, 昵称, 兑现金额) 列表
+        """
+        if not settlements:
+            return
+        
+        players = self._load_json('players.json')
+        now = int(time.time())
+        
+        for user_id, nickname, cashout_amount in settlements:
+            player_data = players.get(user_id)
+            if player_data is None:
+                player_data = players[user_id] = {
+                    'user_id': user_id,
+                    'nickname': nickname,
+                    'total_chips': 0,
+                    'total_winnings': 0,
+                    'games_played': 0,
+                    'hands_won': 0,
+                    'created_at': now
+                }
+            elif cashout_amount > 0:
+                # 仅已注册玩家兑现筹码（与 process_cashout 保持一致）
+                player_data['total_chips'] = player_data.get('total_chips', 0) + cashout_amount
+            
+            player_data['nickname'] = nickname
+            player_data['games_played'] = player_data.get('games_played', 0) + 1
+            player_data['last_played'] = now
+        
+        self._save_json('players.json', players)
+    
     def get_group_ranking(self, group_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """获取群组排行榜"""
         # 这里简化处理，实际应该按群组统计
@@ -281,6 +388,7 @@ class StorageManager:
         """保存迁移信息"""
         self._save_json('migration_info.json', migration_info)
     
+    @_synchronized
     def mark_migration_complete(self, migration_type: str) -> None:
         """标记特定类型的迁移已完成"""
         migration_info = self.get_migration_info()
@@ -306,7 +414,7 @@ class StorageManager:
             清理统计信息
         """
         if keep_days is None:
-            keep_days = self.get_plugin_config_value('auto_cleanup_days', 30)
+            keep_days = self.get_plugin_config().auto_cleanup_days
         
         results = {}
         
@@ -323,6 +431,7 @@ class StorageManager:
             
         return results
     
+    @_synchronized
     def _cleanup_old_history(self, keep_days: int) -> int:
         """清理旧的游戏历史记录"""
         current_time = int(time.time())
@@ -400,6 +509,7 @@ class StorageManager:
             logger.error(f"数据备份失败: {e}")
             return None
     
+    @_synchronized
     def restore_from_backup(self, backup_data: Dict[str, Any]) -> bool:
         """
         从备份恢复数据
@@ -429,6 +539,7 @@ class StorageManager:
             # 恢复配置
             if 'config' in backup_data:
                 self._save_json('config.json', backup_data['config'])
+                self.invalidate_config_cache()
             
             logger.info("数据恢复完成")
             return True
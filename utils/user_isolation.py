@@ -38,8 +38,8 @@ class UserIsolation:
             
             isolated_id = f"{platform_name}:{sender_id}:{session_id}"
             
-            # 记录调试信息
-            logger.debug(f"生成隔离用户ID: {isolated_id} (平台:{platform_name}, 用户:{sender_id}, 会话:{session_id})")
+            # 记录调试信息（惰性格式化，每条命令都会调用）
+            logger.debug("生成隔离用户ID: %s (平台:%s, 用户:%s, 会话:%s)", isolated_id, platform_name, sender_id, session_id)
             
             return isolated_id
             
@@ -50,6 +50,22 @@ class UserIsolation:
             logger.warning(f"使用回退用户ID: {fallback_id}")
             return fallback_id
     
+    @staticmethod
+    def get_event_ids(event: AstrMessageEvent) -> Tuple[str, str]:
+        """
+        在命令入口一次性解析用户与群组ID
+        
+        私聊时没有群组ID，以隔离用户ID作为游戏所在的"群组"
+        
+        Args:
+            event: 消息事件对象
+            
+        Returns:
+            (隔离用户ID, 群组ID) 的元组
+        """
+        user_id = UserIsolation.get_isolated_user_id(event)
+        return user_id, event.get_group_id() or user_id
+    
     @staticmethod
     def extract_original_user_id(isolated_user_id: str) -> Optional[str]:
         """